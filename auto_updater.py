@@ -1,22 +1,50 @@
-import schedule
 import time
 import json
 import os
+import threading
 from datetime import datetime
-from html_inspector import inspect_amazon, inspect_product_hunt
-from scraper import ProductScraper
+from config_manager import SelectorConfigManager, split_samples
+from scheduler import Scheduler, Job
+from browser_watchdog import watchdog, AllocationTracker
+
+HOUR = 3600
+
+# Scheduled jobs: interval/jitter in hours; 'browser' jobs share one Chrome slot
+JOBS = {
+    'inspection': {'interval': 48, 'jitter': 1, 'group': 'browser'},
+    'scrape-amazon': {'interval': 48, 'jitter': 1, 'group': 'browser'},
+    'scrape-producthunt': {'interval': 48, 'jitter': 1, 'group': None},
+    'compaction': {'interval': 24, 'jitter': 0, 'group': None}
+}
+GROUP_LIMITS = {'browser': 1}
+
+PLATFORM_LABELS = {'amazon': 'Amazon', 'productHunt': 'Product Hunt'}
 
 class AutoUpdater:
-    def __init__(self):
+    def __init__(self, trace_memory=False, interactive=True):
         self.config_file = 'selector_config.json'
         self.log_file = 'update_log.json'
+        self.state_file = 'schedule_state.json'
+        self.products_file = 'products.json'
+        self.config_manager = SelectorConfigManager(self.config_file)
         self.last_config = self.load_config()
+        self.scheduler = None
+        self.force_refresh = set()
+        
+        # Non-interactive runs inspect headless and never wait for Enter
+        self.interactive = interactive
+        self.memory_tracker = AllocationTracker() if trace_memory else None
+        
+        # Jobs run in parallel threads and share these files
+        self._log_lock = threading.Lock()
+        self._products_lock = threading.Lock()
     
     def load_config(self):
         """Load current selector configuration"""
         try:
             with open(self.config_file, 'r') as f:
-                return json.load(f)
+                config, _ = split_samples(json.load(f))
+                return config
         except FileNotFoundError:
             print("⚠️  No config found, will create on first run")
             return None
@@ -30,24 +58,25 @@ class AutoUpdater:
             'details': details
         }
         
-        # Load existing logs
-        logs = []
-        if os.path.exists(self.log_file):
-            try:
-                with open(self.log_file, 'r') as f:
-                    logs = json.load(f)
-            except:
-                logs = []
-        
-        # Append new log
-        logs.append(log_entry)
-        
-        # Keep only last 100 logs
-        logs = logs[-100:]
-        
-        # Save
-        with open(self.log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
+        with self._log_lock:
+            # Load existing logs
+            logs = []
+            if os.path.exists(self.log_file):
+                try:
+                    with open(self.log_file, 'r') as f:
+                        logs = json.load(f)
+                except:
+                    logs = []
+            
+            # Append new log
+            logs.append(log_entry)
+            
+            # Keep only last 100 logs
+            logs = logs[-100:]
+            
+            # Save
+            with open(self.log_file, 'w') as f:
+                json.dump(logs, f, indent=2)
         
         print(f"📝 [{event_type}] {message}")
     
@@ -88,10 +117,13 @@ class AutoUpdater:
         print("=" * 70)
         
         try:
+            # Imported here: html_inspector pulls in selenium
+            from html_inspector import inspect_amazon, inspect_product_hunt
+            
             # Run inspectors
-            amazon_results = inspect_amazon()
+            amazon_results = inspect_amazon(headless=not self.interactive, interactive=self.interactive)
             time.sleep(3)
-            ph_results = inspect_product_hunt()
+            ph_results = inspect_product_hunt(headless=not self.interactive, interactive=self.interactive)
             
             # Create new config
             new_config = {
@@ -123,27 +155,38 @@ class AutoUpdater:
         # The scraper already reads from selector_config.json
         print("\n✅ Scraper will use new selectors from selector_config.json")
     
-    def run_scraper(self):
+    def run_scraper(self, conditional=True):
         """Run the scraper with updated config"""
         print("\n🤖 Running scraper with updated configuration...")
         
+        scraper = None
         try:
-            scraper = ProductScraper(headless=True)
+            from scraper import ProductScraper
+            
+            scraper = ProductScraper(headless=True, conditional=conditional,
+                                     products_file=self.products_file)
             products = scraper.scrape_all(amazon_count=10, ph_count=5)
             
-            if products:
+            if products and not scraper.changed:
+                # Nothing new: no rewrite of products.json, nothing downstream to invalidate
+                self.save_log('SKIPPED', 'All pages unchanged, products.json kept',
+                              scraper.refresh.stats)
+                return True
+            elif products:
                 scraper.save_to_json(products)
-                scraper.close()
                 self.save_log('SUCCESS', f'Scraped {len(products)} products')
                 return True
             else:
-                scraper.close()
                 self.save_log('WARNING', 'Scraper returned no products')
                 return False
                 
         except Exception as e:
             self.save_log('ERROR', f'Scraper failed: {str(e)}')
             return False
+        finally:
+            # Always release Chrome, even when scraping blew up
+            if scraper:
+                scraper.close()
     
     def check_and_update(self):
         """Main update check and execution"""
@@ -158,26 +201,11 @@ class AutoUpdater:
             print("❌ Inspection failed, skipping update")
             return
         
-        # Compare with previous config
-        comparison = self.compare_selectors(self.last_config, new_config)
+        new_config, comparison = self.apply_inspection(new_config)
         
         if comparison['changed']:
-            print(f"\n🚨 CHANGES DETECTED: {comparison.get('count', 'Unknown')} selector(s) changed")
-            
-            # Save new config
-            with open(self.config_file, 'w') as f:
-                json.dump(new_config, f, indent=2)
-            
-            self.save_log('CHANGE_DETECTED', 
-                         f"{comparison.get('count')} selectors changed", 
-                         comparison.get('changes'))
-            
-            # Update scraper
-            if comparison.get('changes'):
-                self.update_scraper_code(comparison['changes'])
-            
-            # Run scraper with new config
-            success = self.run_scraper()
+            # Run scraper with new config (selectors changed, so never skip)
+            success = self.run_scraper(conditional=False)
             
             if success:
                 print("\n✅ Update complete and data refreshed")
@@ -197,12 +225,179 @@ class AutoUpdater:
         print("✅ Auto-update cycle complete")
         print("=" * 70)
     
+    def apply_inspection(self, new_config):
+        """Compare inspected selectors with the last config and save them if changed"""
+        # Samples live in their own file, so compare selectors only
+        slim_config, _ = split_samples(new_config)
+        
+        # Compare with previous config
+        comparison = self.compare_selectors(self.last_config, slim_config)
+        
+        if comparison['changed']:
+            # Save the full config so the new samples reach selector_samples.json
+            # (running scrapers pick it up on their next lookup)
+            saved = self.config_manager.save_config(new_config)
+            if saved is None:
+                self.save_log('WARNING', 'Inspected selectors unusable, keeping current config')
+                return self.last_config, {'changed': False, 'changes': [], 'count': 0}
+            
+            # Broken platforms kept their previous selectors - compare what was saved
+            slim_config = saved
+            comparison = self.compare_selectors(self.last_config, slim_config)
+        
+        if comparison['changed']:
+            print(f"\n🚨 CHANGES DETECTED: {comparison.get('count', 'Unknown')} selector(s) changed")
+            
+            self.save_log('CHANGE_DETECTED', 
+                         f"{comparison.get('count')} selectors changed", 
+                         comparison.get('changes'))
+            
+            # Update scraper
+            if comparison.get('changes'):
+                self.update_scraper_code(comparison['changes'])
+        
+        return slim_config, comparison
+    
+    def inspection_job(self):
+        """Scheduled job: inspect selectors, rescrape right away if they changed"""
+        new_config = self.run_inspection()
+        
+        if not new_config:
+            print("❌ Inspection failed, keeping current selectors")
+            return False
+        
+        new_config, comparison = self.apply_inspection(new_config)
+        
+        if comparison['changed']:
+            self.last_config = new_config
+            # New selectors can extract differently from the same page - don't skip
+            self.force_refresh.update(PLATFORM_LABELS)
+            if self.scheduler:
+                self.scheduler.run_now('scrape-amazon')
+                self.scheduler.run_now('scrape-producthunt')
+        else:
+            print("\n✅ No changes detected - selectors still valid")
+            self.save_log('NO_CHANGE', 'Selectors unchanged')
+        
+        return True
+    
+    def scrape_platform(self, platform):
+        """Scheduled job: refresh one platform's products in products.json"""
+        from scraper import ProductScraper
+        
+        label = PLATFORM_LABELS[platform]
+        conditional = platform not in self.force_refresh
+        self.force_refresh.discard(platform)
+        scraper = ProductScraper(headless=True, conditional=conditional,
+                                 products_file=self.products_file)
+        
+        try:
+            if platform == 'amazon':
+                products = scraper.scrape_amazon_bestsellers(10)
+            else:
+                products = scraper.generate_mock_product_hunt(5)
+        finally:
+            scraper.close()
+        
+        if not products:
+            self.save_log('WARNING', f'{label} scrape returned no products')
+            return False
+        
+        if scraper.refresh:
+            stats = scraper.refresh.report()
+            if platform in scraper.unchanged:
+                self.save_log('SKIPPED', f'{label} unchanged, products.json kept', stats)
+                return True
+        
+        with self._products_lock:
+            # Keep the other platforms' products from their own last run
+            existing = []
+            try:
+                with open(self.products_file, 'r', encoding='utf-8') as f:
+                    existing = json.load(f).get('products', [])
+            except (FileNotFoundError, ValueError):
+                pass
+            
+            merged = [p for p in existing if p.get('platform') != label] + products
+            order = list(PLATFORM_LABELS.values())
+            merged.sort(key=lambda p: (order.index(p['platform']) if p.get('platform') in order else len(order),
+                                       p.get('rank', 0)))
+            
+            scraper.save_to_json(merged, self.products_file)
+        
+        self.save_log('SUCCESS', f'Scraped {len(products)} {label} products')
+        return True
+    
+    def compaction_job(self):
+        """Scheduled job: trim the update log and remove stale temp files"""
+        with self._log_lock:
+            try:
+                with open(self.log_file, 'r') as f:
+                    logs = json.load(f)
+                with open(self.log_file, 'w') as f:
+                    json.dump(logs[-100:], f, indent=2)
+            except (FileNotFoundError, ValueError):
+                pass
+        
+        # Leftovers from interrupted atomic writes
+        removed = 0
+        cutoff = time.time() - HOUR
+        for name in os.listdir('.'):
+            if '.tmp.' not in name:
+                continue
+            # Another job's atomic write may rename it away at any moment
+            try:
+                if os.path.getmtime(name) < cutoff:
+                    os.remove(name)
+                    removed += 1
+            except OSError:
+                continue
+        
+        if removed:
+            print(f"🧹 Removed {removed} stale temp file(s)")
+        
+        # Browsers left behind by crashed runs
+        watchdog.kill_orphans()
+        watchdog.report()
+        return True
+    
+    def _traced(self, name, func):
+        """Wrap a job so Python allocation growth is reported after each run"""
+        if not self.memory_tracker:
+            return func
+        
+        def run():
+            try:
+                return func()
+            finally:
+                self.memory_tracker.report(name)
+        return run
+    
+    def build_scheduler(self):
+        """Create the scheduler with all auto-update jobs"""
+        scheduler = Scheduler(self.state_file, workers=len(JOBS), group_limits=GROUP_LIMITS)
+        funcs = {
+            'inspection': self.inspection_job,
+            'scrape-amazon': lambda: self.scrape_platform('amazon'),
+            'scrape-producthunt': lambda: self.scrape_platform('productHunt'),
+            'compaction': self.compaction_job
+        }
+        
+        for name, spec in JOBS.items():
+            scheduler.add_job(Job(name, self._traced(name, funcs[name]),
+                                  interval=spec['interval'] * HOUR,
+                                  jitter=spec['jitter'] * HOUR,
+                                  group=spec['group']))
+        return scheduler
+    
     def start_scheduled_updates(self):
-        """Start the scheduler - runs every 48 hours"""
+        """Start the scheduler and block until Ctrl+C"""
         print("\n" + "=" * 70)
         print("🤖 AUTO-UPDATER STARTED")
         print("=" * 70)
-        print("📅 Schedule: Every 48 hours")
+        print("📅 Schedule:")
+        for name, spec in JOBS.items():
+            print(f"   • {name}: every {spec['interval']}h (±{spec['jitter']}h)")
         print("🔍 Actions:")
         print("   1. Inspect HTML structure")
         print("   2. Detect selector changes")
@@ -210,24 +405,24 @@ class AutoUpdater:
         print("   4. Run scraper with new config")
         print("=" * 70)
         
-        # Run immediately on start
-        print("\n🚀 Running initial check...")
-        self.check_and_update()
+        # Chrome/chromedriver left over from a previous crash
+        watchdog.kill_orphans()
         
-        # Schedule for every 48 hours
-        schedule.every(48).hours.do(self.check_and_update)
+        self.scheduler = self.build_scheduler()
         
-        print("\n⏰ Next check in 48 hours")
+        print("\n⏰ Upcoming runs:")
+        for name, when in self.scheduler.next_runs():
+            print(f"   • {name}: {when.strftime('%Y-%m-%d %H:%M:%S')}")
         print("💡 Press Ctrl+C to stop\n")
         
-        # Keep running
+        # Sleeps until the next job is due; missed runs are caught up on start
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+            self.scheduler.run_forever()
         except KeyboardInterrupt:
             print("\n\n⚠️  Auto-updater stopped by user")
             self.save_log('STOPPED', 'Auto-updater stopped manually')
+        finally:
+            watchdog.shutdown()
 
 
 def main():
@@ -250,7 +445,8 @@ def main():
     choice = input("\nStart auto-updater? (y/n): ").lower()
     
     if choice == 'y':
-        updater = AutoUpdater()
+        # TRENDTRACKER_TRACEMALLOC=1 reports Python allocation growth per job
+        updater = AutoUpdater(trace_memory=os.environ.get('TRENDTRACKER_TRACEMALLOC') == '1')
         updater.start_scheduled_updates()
     else:
         print("\n✋ Auto-updater not started")
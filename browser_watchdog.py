@@ -0,0 +1,364 @@
+"""
+Browser process watchdog.
+
+Tracks every chromedriver/Chrome process tree we launch, samples RSS and
+CPU, tells callers when a session should be recycled (memory cap, page
+count, age) and kills leftovers at startup and shutdown. Uses psutil when
+installed and falls back to /proc and signals on POSIX. On Windows the
+watchdog needs psutil; without it process checks and kills are skipped.
+
+Also has an optional tracemalloc hook to report Python allocation growth
+between update cycles.
+"""
+import atexit
+import json
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from config_manager import write_json_atomic
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BROWSER_NAMES = ('chromedriver', 'chrome', 'chromium')
+
+# os.kill(pid, 0) / SIGKILL only mean "probe" / "kill" on POSIX
+PROCESS_CONTROL = psutil is not None or os.name == 'posix'
+
+
+# ---------------------------------------------------------------------------
+# Process helpers (psutil or /proc)
+# ---------------------------------------------------------------------------
+
+def _alive(pid):
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if not PROCESS_CONTROL:
+        # On Windows os.kill(pid, 0) would send CTRL_C_EVENT
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _cmdline(pid):
+    if psutil is not None:
+        try:
+            return ' '.join(psutil.Process(pid).cmdline())
+        except psutil.Error:
+            return ''
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode('utf-8', errors='replace')
+    except OSError:
+        return ''
+
+
+def _children(pid):
+    """All descendant PIDs of pid"""
+    if psutil is not None:
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    parents = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # Field 4 is the parent PID; comm (field 2) may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            parents.setdefault(ppid, []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    result = []
+    stack = [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def _usage(pid):
+    """(rss_bytes, cpu_seconds) for one process, or None if gone"""
+    if psutil is not None:
+        try:
+            p = psutil.Process(pid)
+            cpu = p.cpu_times()
+            return p.memory_info().rss, cpu.user + cpu.system
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        ticks = os.sysconf('SC_CLK_TCK')
+        return rss, (int(fields[11]) + int(fields[12])) / ticks
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _kill_tree(pid):
+    """SIGKILL pid and its descendants; returns how many were killed"""
+    killed = 0
+    for target in _children(pid) + [pid]:
+        if psutil is not None:
+            try:
+                psutil.Process(target).kill()
+                killed += 1
+            except psutil.Error:
+                pass
+            continue
+        if not PROCESS_CONTROL:
+            continue
+        try:
+            os.kill(target, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    return killed
+
+
+def _driver_pid(driver):
+    """chromedriver PID behind a selenium driver (Chrome is its child)"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Watchdog
+# ---------------------------------------------------------------------------
+
+class BrowserSession:
+    """One tracked browser process tree"""
+
+    def __init__(self, pid, label):
+        self.pid = pid
+        self.label = label
+        self.started = time.time()
+        self.pages = 0
+        self.rss_mb = 0.0
+        self.cpu_percent = 0.0
+        self._last_cpu = None
+        self._last_sample = None
+
+
+class BrowserWatchdog:
+    def __init__(self, pid_file='browser_pids.json', max_rss_mb=1500, max_pages=200, max_age=6 * 3600):
+        self.pid_file = pid_file
+        self.max_rss_mb = max_rss_mb
+        self.max_pages = max_pages
+        self.max_age = max_age
+
+        self.sessions = {}
+        self._warned = False
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    # -- pid file ----------------------------------------------------------------
+
+    def _read_pid_file(self):
+        try:
+            with open(self.pid_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_pid_file(self, entries):
+        try:
+            if entries:
+                write_json_atomic(self.pid_file, entries)
+            elif os.path.exists(self.pid_file):
+                os.remove(self.pid_file)
+        except OSError as e:
+            print(f"⚠️  Could not update {self.pid_file}: {e}")
+
+    # -- sessions ----------------------------------------------------------------
+
+    def register(self, driver, label='browser'):
+        """Start tracking the process tree behind a driver"""
+        pid = _driver_pid(driver)
+        if pid is None:
+            return None
+        if not PROCESS_CONTROL and not self._warned:
+            self._warned = True
+            print("⚠️  psutil not installed - browser processes cannot be checked or killed on this OS "
+                  "(pip install psutil)")
+
+        with self._lock:
+            session = BrowserSession(pid, label)
+            self.sessions[id(driver)] = session
+
+            entries = self._read_pid_file()
+            entries[str(pid)] = {
+                'label': label,
+                'owner': os.getpid(),
+                'started': datetime.now().isoformat()
+            }
+            self._write_pid_file(entries)
+        return session
+
+    def note_page(self, driver):
+        """Count a page load against the session's page budget"""
+        session = self.sessions.get(id(driver))
+        if session:
+            session.pages += 1
+
+    def sample(self, driver):
+        """Refresh RSS/CPU for a session's whole process tree"""
+        session = self.sessions.get(id(driver))
+        if not session:
+            return None
+
+        rss = cpu = 0
+        for pid in [session.pid] + _children(session.pid):
+            usage = _usage(pid)
+            if usage:
+                rss += usage[0]
+                cpu += usage[1]
+
+        now = time.monotonic()
+        if session._last_sample is not None and now > session._last_sample:
+            session.cpu_percent = round(100 * (cpu - session._last_cpu) / (now - session._last_sample), 1)
+        session._last_cpu = cpu
+        session._last_sample = now
+        session.rss_mb = round(rss / (1024 * 1024), 1)
+        return session
+
+    def check(self, driver):
+        """Return a reason string if the session should be recycled, else None"""
+        session = self.sample(driver)
+        if not session:
+            return None
+        if self.max_rss_mb and session.rss_mb > self.max_rss_mb:
+            return f"RSS {session.rss_mb} MB > {self.max_rss_mb} MB"
+        if self.max_pages and session.pages >= self.max_pages:
+            return f"{session.pages} pages >= {self.max_pages}"
+        if self.max_age and time.time() - session.started > self.max_age:
+            return f"session older than {self.max_age // 3600}h"
+        return None
+
+    def quit(self, driver):
+        """Quit a driver and kill anything its tree left behind"""
+        session = self.sessions.get(id(driver))
+        pid = session.pid if session else _driver_pid(driver)
+        leftovers = _children(pid) if pid else []
+
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️  driver.quit() failed: {str(e)[:80]}")
+
+        # Chrome renderers/zygotes sometimes outlive chromedriver
+        killed = 0
+        for child in leftovers:
+            if _alive(child):
+                killed += _kill_tree(child)
+        if pid and _alive(pid):
+            killed += _kill_tree(pid)
+        if killed:
+            print(f"🧹 Killed {killed} leftover browser process(es)")
+
+        with self._lock:
+            self.sessions.pop(id(driver), None)
+            if pid:
+                entries = self._read_pid_file()
+                entries.pop(str(pid), None)
+                self._write_pid_file(entries)
+
+    def kill_orphans(self):
+        """Kill browser trees recorded by processes that are no longer running"""
+        with self._lock:
+            entries = self._read_pid_file()
+            killed = 0
+
+            for pid_str, info in list(entries.items()):
+                pid = int(pid_str)
+                owner = info.get('owner')
+                if owner == os.getpid() or (owner and _alive(owner)):
+                    continue
+                # Guard against PID reuse: only kill things that still look like a browser
+                if _alive(pid) and any(name in _cmdline(pid).lower() for name in BROWSER_NAMES):
+                    killed += _kill_tree(pid)
+                entries.pop(pid_str)
+
+            self._write_pid_file(entries)
+
+        if killed:
+            print(f"🧹 Killed {killed} orphaned browser process(es)")
+        return killed
+
+    def report(self):
+        """Print RSS/CPU/pages for all live sessions"""
+        for session in list(self.sessions.values()):
+            print(f"   🖥️  {session.label} (pid {session.pid}): {session.rss_mb} MB, "
+                  f"{session.cpu_percent}% CPU, {session.pages} pages")
+
+    def shutdown(self):
+        """Kill every browser tree this process still tracks"""
+        with self._lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+            entries = self._read_pid_file()
+            for session in sessions:
+                if _alive(session.pid):
+                    _kill_tree(session.pid)
+                entries.pop(str(session.pid), None)
+            if sessions:
+                self._write_pid_file(entries)
+
+
+# Shared by scraper, html_inspector and auto_updater
+watchdog = BrowserWatchdog()
+
+
+class AllocationTracker:
+    """tracemalloc snapshot diff between update cycles"""
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._last = self._snapshot()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+
+    def report(self, label='cycle'):
+        """Print the biggest allocation growth since the last report"""
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._last, 'lineno')
+        self._last = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        growth = sum(stat.size_diff for stat in stats)
+        print(f"\n🧠 Python allocations after {label}: {current / 1024 / 1024:.1f} MB "
+              f"(peak {peak / 1024 / 1024:.1f} MB, {growth / 1024:+.1f} KB since last)")
+        for stat in stats[:self.top]:
+            if stat.size_diff > 0:
+                print(f"   {stat.size_diff / 1024:+8.1f} KB  {stat.traceback}")
+        return growth
@@ -0,0 +1,330 @@
+"""
+Columnar history snapshots for analysis.
+
+Each saved scrape is also written to history/ as one .ttc file:
+
+    magic | column blocks (64-byte aligned) | footer JSON | footer length | magic
+
+Numeric columns are fixed-width little-endian arrays:
+    rank        int32
+    price       float64   parsed from the price text, NaN if there is no number
+    scraped_at  int64     microseconds since 1970-01-01 (NaT/INT64_MIN if missing)
+
+Text columns are dictionary-encoded: a uint32 code per row plus a
+zlib-compressed dictionary of distinct values, decoded only when asked for.
+
+Readers mmap the file and hand out views straight into the mapping
+(NumPy arrays when numpy is installed, memoryviews otherwise), so scanning
+one column across many snapshots only touches that column's pages.
+
+Usage:
+    python columnar_snapshots.py                      (price summary over history/)
+    python columnar_snapshots.py --column rank
+    python columnar_snapshots.py --write products.json
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HISTORY_DIR = 'history'
+EXTENSION = '.ttc'
+
+MAGIC = b'TTCOL\x00\x01\x00'
+ALIGN = 64
+NULL_CODE = 0xFFFFFFFF
+NULL_TIME = -(2 ** 63)
+
+# type -> (array/memoryview format, numpy dtype)
+TYPES = {
+    'i32': ('i', '<i4'),
+    'f64': ('d', '<f8'),
+    'i64': ('q', '<i8'),
+    'dict': ('I', '<u4'),
+}
+
+NUMERIC_COLUMNS = {
+    'rank': 'i32',
+    'price': 'f64',
+    'scraped_at': 'i64',
+}
+
+# column name -> product key
+TEXT_COLUMNS = {
+    'platform': 'platform',
+    'category': 'category',
+    'title': 'title',
+    'description': 'description',
+    'price_text': 'price',
+    'rating': 'rating',
+    'link': 'link',
+    'image': 'image',
+}
+
+_PRICE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_price(text):
+    """'$1,299.99' -> 1299.99, 'Free' -> 0.0, anything without a number -> NaN"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    if not text:
+        return math.nan
+    if text.strip().lower() == 'free':
+        return 0.0
+    match = _PRICE.search(text)
+    return float(match.group(0).replace(',', '')) if match else math.nan
+
+
+def parse_timestamp(text):
+    """ISO timestamp -> microseconds since the epoch (naive, like datetime64)"""
+    try:
+        delta = datetime.fromisoformat(text) - _EPOCH
+    except (TypeError, ValueError):
+        return NULL_TIME
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _packed(fmt, values):
+    data = array(fmt, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _encode_column(products, name):
+    """(type, block bytes, compressed dictionary or None) for one column"""
+    if name in NUMERIC_COLUMNS:
+        kind = NUMERIC_COLUMNS[name]
+        if name == 'rank':
+            values = [int(p.get('rank') or 0) for p in products]
+        elif name == 'price':
+            values = [parse_price(p.get('price')) for p in products]
+        else:
+            values = [parse_timestamp(p.get('scrapedAt')) for p in products]
+        return kind, _packed(TYPES[kind][0], values), None
+
+    key = TEXT_COLUMNS[name]
+    index = {}
+    codes = []
+    for product in products:
+        value = product.get(key)
+        if value is None:
+            codes.append(NULL_CODE)
+        else:
+            codes.append(index.setdefault(str(value), len(index)))
+    dictionary = zlib.compress(json.dumps(list(index), ensure_ascii=False).encode('utf-8'), 6)
+    return 'dict', _packed('I', codes), dictionary
+
+
+def snapshot_name(last_update):
+    try:
+        stamp = datetime.fromisoformat(last_update)
+    except (TypeError, ValueError):
+        stamp = datetime.now()
+    return f"products-{stamp.strftime('%Y%m%d-%H%M%S')}{EXTENSION}"
+
+
+def write_snapshot(data, history_dir=HISTORY_DIR):
+    """Write one products.json payload as a columnar snapshot; returns its path"""
+    products = data.get('products', [])
+    os.makedirs(history_dir, exist_ok=True)
+    path = os.path.join(history_dir, snapshot_name(data.get('lastUpdate')))
+
+    chunks = [MAGIC]
+    position = len(MAGIC)
+    columns = []
+
+    def place(block):
+        nonlocal position
+        padding = -position % ALIGN
+        chunks.append(b'\0' * padding)
+        chunks.append(block)
+        offset = position + padding
+        position = offset + len(block)
+        return offset
+
+    for name in list(NUMERIC_COLUMNS) + list(TEXT_COLUMNS):
+        kind, block, dictionary = _encode_column(products, name)
+        column = {'name': name, 'type': kind, 'offset': place(block), 'bytes': len(block)}
+        if dictionary is not None:
+            column['dictOffset'] = place(dictionary)
+            column['dictBytes'] = len(dictionary)
+        columns.append(column)
+
+    footer = json.dumps({
+        'rows': len(products),
+        'lastUpdate': data.get('lastUpdate'),
+        'columns': columns
+    }, separators=(',', ':')).encode('utf-8')
+    chunks += [footer, struct.pack('<I', len(footer)), MAGIC]
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(chunks))
+    os.replace(tmp_path, path)
+    return path
+
+
+class ColumnarSnapshot:
+    """Memory-mapped reader for one .ttc file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        tail = len(MAGIC) + 4
+        if len(self._mm) < 2 * len(MAGIC) + 4 or self._mm[:len(MAGIC)] != MAGIC \
+                or self._mm[-len(MAGIC):] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a columnar snapshot")
+
+        footer_len = struct.unpack_from('<I', self._mm, len(self._mm) - tail)[0]
+        footer = json.loads(self._mm[len(self._mm) - tail - footer_len:len(self._mm) - tail])
+        self.rows = footer['rows']
+        self.last_update = footer.get('lastUpdate')
+        self.columns = {c['name']: c for c in footer['columns']}
+
+    def column(self, name):
+        """
+        Zero-copy view of a fixed-width column (codes for text columns).
+        NumPy array if numpy is installed, else a typed memoryview.
+        """
+        spec = self.columns[name]
+        fmt, dtype = TYPES[spec['type']]
+        if np is not None:
+            return np.frombuffer(self._mm, dtype=dtype, count=self.rows, offset=spec['offset'])
+        view = memoryview(self._mm)[spec['offset']:spec['offset'] + spec['bytes']]
+        if sys.byteorder != 'little':
+            # No zero-copy on big-endian hosts without numpy
+            data = array(fmt, view.tobytes())
+            data.byteswap()
+            return memoryview(data)
+        return view.cast(fmt)
+
+    def ranks(self):
+        return self.column('rank')
+
+    def prices(self):
+        return self.column('price')
+
+    def timestamps(self):
+        """scraped_at as datetime64[us] (numpy) or int64 microseconds"""
+        view = self.column('scraped_at')
+        return view.view('datetime64[us]') if np is not None else view
+
+    def dictionary(self, name):
+        spec = self.columns[name]
+        start = spec['dictOffset']
+        return json.loads(zlib.decompress(self._mm[start:start + spec['dictBytes']]))
+
+    def strings(self, name):
+        """Decoded values of a text column (this one does deserialize)"""
+        values = self.dictionary(name)
+        return [None if code == NULL_CODE else values[code] for code in self.column(name)]
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            # Views are still alive; the mapping goes away with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def find_snapshots(history_dir=HISTORY_DIR):
+    try:
+        names = os.listdir(history_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(os.path.join(history_dir, n) for n in names if n.endswith(EXTENSION))
+
+
+def scan(column, history_dir=HISTORY_DIR):
+    """Yield (snapshot, view) for one column across all snapshots, oldest first"""
+    for path in find_snapshots(history_dir):
+        try:
+            snapshot = ColumnarSnapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path}: {e}")
+            continue
+        yield snapshot, snapshot.column(column)
+
+
+def summarize(column, history_dir=HISTORY_DIR):
+    """Print per-column totals across history and how long the scan took"""
+    started = time.perf_counter()
+    files = rows = 0
+    low, high, total, counted = math.inf, -math.inf, 0.0, 0
+
+    for snapshot, view in scan(column, history_dir):
+        files += 1
+        rows += snapshot.rows
+        if not snapshot.rows:
+            continue
+        if np is not None:
+            values = view.astype('f8') if view.dtype.kind != 'f' else view
+            if column == 'scraped_at':
+                values = values[view != NULL_TIME]
+            values = values[~np.isnan(values)]
+            if len(values):
+                low, high = min(low, values.min()), max(high, values.max())
+                total += values.sum()
+                counted += len(values)
+        else:
+            for value in view:
+                if value != value or (column == 'scraped_at' and value == NULL_TIME):
+                    continue
+                low, high = min(low, value), max(high, value)
+                total += value
+                counted += 1
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"📚 {column}: {files} snapshot(s), {rows} rows scanned in {elapsed:.1f} ms "
+          f"({'numpy' if np is not None else 'memoryview'})")
+    if counted and column == 'scraped_at':
+        first, last = (_EPOCH + timedelta(microseconds=int(v)) for v in (low, high))
+        print(f"   from {first:%Y-%m-%d %H:%M} to {last:%Y-%m-%d %H:%M}  ({counted} non-null)")
+    elif counted:
+        print(f"   min {low:.2f}  max {high:.2f}  mean {total / counted:.2f}  ({counted} non-null)")
+    return {'files': files, 'rows': rows, 'ms': elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Columnar history snapshots')
+    parser.add_argument('--dir', default=HISTORY_DIR, help='Snapshot directory')
+    parser.add_argument('--column', default='price', choices=list(NUMERIC_COLUMNS))
+    parser.add_argument('--write', metavar='JSON', help='Convert a products.json file into a snapshot')
+    args = parser.parse_args(argv)
+
+    if args.write:
+        with open(args.write, 'r', encoding='utf-8') as f:
+            path = write_snapshot(json.load(f), args.dir)
+        print(f"✅ Wrote {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+        return
+
+    summarize(args.column, args.dir)
+
+
+if __name__ == "__main__":
+    main()
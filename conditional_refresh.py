@@ -0,0 +1,165 @@
+"""
+Conditional refresh: skip pages that have not changed since the last run.
+
+Per URL we keep the validators from the last successful save:
+    etag / lastModified  -> conditional GET (304 = skip without a browser)
+    contentHash          -> normalized hash of the product container region
+    planHash             -> fingerprint of the extraction plan the products came from
+
+Hashes only become the new baseline once the products were saved
+(commit()), so a failed save never causes the next run to skip. A changed
+plan counts as a changed page. Probe outcomes (validator-less or refused
+sites) are saved right away, since they hold whether or not anything is.
+"""
+import hashlib
+import json
+import re
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+from config_manager import write_json_atomic
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Sites that answered without validators (or refused the probe) are re-probed after this
+REPROBE_AFTER = timedelta(days=7)
+
+# Validators of every platform share one state file; jobs commit concurrently
+_STATE_LOCK = threading.Lock()
+
+# Parts of the markup that change on every load without the list changing
+_VOLATILE = [
+    (re.compile(r'(href|src)="([^"?#]*)[?#][^"]*"'), r'\1="\2"'),   # tracking query strings
+    (re.compile(r'/ref=[^"/?]*'), ''),                              # Amazon ref= path segments
+    (re.compile(r'\s(?:id|data-card-metrics-id)="CardInstance[^"]*"'), ''),
+    (re.compile(r'\sdata-(?:csa|a-|p13n-sc-c)[\w-]*="[^"]*"'), ''),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normalize_region(html):
+    """Strip per-load noise so equal product lists hash equally"""
+    for pattern, replacement in _VOLATILE:
+        html = pattern.sub(replacement, html)
+    return html.strip()
+
+
+def region_hash(html):
+    return hashlib.sha256(normalize_region(html).encode('utf-8')).hexdigest()
+
+
+class RefreshValidator:
+    def __init__(self, state_file='refresh_state.json', timeout=10):
+        self.state_file = state_file
+        self.timeout = timeout
+        self.state = self.load_state()
+        self._pending = {}
+        self.stats = {'checked': 0, 'skipped': 0, 'notModified': 0, 'sameContent': 0}
+
+    def load_state(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def probe(self, url, plan_key=None):
+        """
+        Conditional GET. Returns True if the server says 304 Not Modified and
+        the saved products came from the same extraction plan, False if it
+        changed or cannot tell. Sites that send no validators or refuse the
+        probe (e.g. 503 to urllib) are not probed again for a while.
+        """
+        entry = self.state.get(url, {})
+        if entry.get('validators') is False and not self._reprobe_due(entry):
+            return False
+
+        headers = {'User-Agent': USER_AGENT}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response_headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return entry.get('planHash') == plan_key
+            self._no_validators(url)
+            return False
+        except (urllib.error.URLError, OSError):
+            return False
+
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if etag or last_modified:
+            pending = self._pending.setdefault(url, {})
+            pending['etag'] = etag
+            pending['lastModified'] = last_modified
+            pending['validators'] = True
+        else:
+            self._no_validators(url)
+        return False
+
+    def _no_validators(self, url):
+        """Remember now (not at commit()) that this site cannot be probed"""
+        values = {'validators': False, 'probedAt': datetime.now().isoformat()}
+        with _STATE_LOCK:
+            state = self.load_state()
+            state.setdefault(url, {}).update(values)
+            write_json_atomic(self.state_file, state)
+        self.state.setdefault(url, {}).update(values)
+
+    def _reprobe_due(self, entry):
+        try:
+            probed = datetime.fromisoformat(entry['probedAt'])
+        except (KeyError, TypeError, ValueError):
+            # Recorded before probedAt existed
+            return True
+        return datetime.now() - probed > REPROBE_AFTER
+
+    def unchanged(self, url, region_html, plan_key=None):
+        """True if the normalized container region and the plan match the last saved run"""
+        digest = region_hash(region_html)
+        pending = self._pending.setdefault(url, {})
+        pending['contentHash'] = digest
+        pending['planHash'] = plan_key
+        entry = self.state.get(url, {})
+        return entry.get('contentHash') == digest and entry.get('planHash') == plan_key
+
+    def record(self, url, not_modified=False, same_content=False):
+        """Count a checked page and whether it was skipped"""
+        self.stats['checked'] += 1
+        if not_modified or same_content:
+            self.stats['skipped'] += 1
+        if not_modified:
+            self.stats['notModified'] += 1
+        if same_content:
+            self.stats['sameContent'] += 1
+
+    def commit(self):
+        """Make the validators seen this run the new baseline (after a successful save)"""
+        if not self._pending:
+            return
+        now = datetime.now().isoformat()
+        with _STATE_LOCK:
+            # Merge into the file as it is now - another platform's job may have committed
+            state = self.load_state()
+            for url, values in self._pending.items():
+                entry = state.setdefault(url, {})
+                entry.update(values)
+                entry['savedAt'] = now
+            write_json_atomic(self.state_file, state)
+        self.state = state
+        self._pending = {}
+
+    def report(self):
+        s = self.stats
+        print(f"⏭️  Conditional refresh: skipped {s['skipped']}/{s['checked']} page(s) "
+              f"({s['notModified']} not modified, {s['sameContent']} same content)")
+        return dict(s)
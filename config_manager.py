@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Default selectors based on the original inspection
+DEFAULT_CONFIG = {
+    'platforms': {
+        'amazon': {
+            'selectors': {
+                'container': {'selector': 'div[id][class*="p13n"]'},
+                'price': 'span[class*="price"]',
+                'image': 'img',
+                'link': 'a.a-link-normal'
+            }
+        }
+    }
+}
+
+# Compiled plans shared by every manager in the process, keyed by content hash
+_PLAN_CACHE = {}
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+class ExtractionPlan:
+    """Flattened, read-only selectors for one platform"""
+
+    __slots__ = ('platform', 'url', 'container', 'fields')
+
+    def __init__(self, platform, url, container, fields):
+        self.platform = platform
+        self.url = url
+        self.container = container
+        self.fields = fields
+
+    def get(self, field, default=None):
+        """Return the selector for a field, or default"""
+        return self.fields.get(field, default)
+
+    def fingerprint(self):
+        """Hash of the selectors, so results extracted with another plan can be told apart"""
+        raw = json.dumps([self.container, self.fields], sort_keys=True)
+        return content_hash(raw.encode('utf-8'))[:16]
+
+    def __repr__(self):
+        return f"ExtractionPlan({self.platform!r}, container={self.container!r})"
+
+
+def content_hash(raw):
+    """Hash raw config bytes"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def validate_platform(name, platform):
+    """Return a list of problems found in one platform entry (empty if valid)"""
+    if not isinstance(platform, dict):
+        return [f"{name}: platform entry must be an object"]
+
+    selectors = platform.get('selectors')
+    if not isinstance(selectors, dict):
+        return [f"{name}: 'selectors' must be an object"]
+
+    errors = []
+    container = selectors.get('container')
+    if isinstance(container, dict):
+        container = container.get('selector')
+    if not isinstance(container, str) or not container.strip():
+        errors.append(f"{name}: missing container selector")
+
+    for key, value in selectors.items():
+        if key != 'container' and not isinstance(value, str):
+            errors.append(f"{name}.{key}: selector must be a string")
+
+    return errors
+
+
+def validate_config(config):
+    """Return a list of problems found in a selector config (empty if valid)"""
+    if not isinstance(config, dict):
+        return ['config must be a JSON object']
+
+    platforms = config.get('platforms')
+    if not isinstance(platforms, dict) or not platforms:
+        return ["'platforms' must be a non-empty object"]
+
+    errors = []
+    for name, platform in platforms.items():
+        errors.extend(validate_platform(name, platform))
+    return errors
+
+
+def sanitize_config(config, previous=None):
+    """
+    Keep the platforms that validate. A broken platform keeps its entry
+    from previous (if that one is valid) or is dropped.
+    Returns (config, errors); config is None if no platform is usable.
+    """
+    if not isinstance(config, dict):
+        return None, ['config must be a JSON object']
+
+    platforms = config.get('platforms')
+    if not isinstance(platforms, dict) or not platforms:
+        return None, ["'platforms' must be a non-empty object"]
+
+    previous_platforms = (previous or {}).get('platforms', {})
+    kept = {}
+    errors = []
+
+    for name, platform in platforms.items():
+        problems = validate_platform(name, platform)
+        if not problems:
+            kept[name] = platform
+            continue
+
+        errors.extend(problems)
+        fallback = previous_platforms.get(name)
+        if fallback is not None and not validate_platform(name, fallback):
+            kept[name] = fallback
+            errors.append(f"{name}: keeping previous selectors")
+        else:
+            errors.append(f"{name}: dropped")
+
+    if not kept:
+        return None, errors
+    return dict(config, platforms=kept), errors
+
+
+def compile_config(config):
+    """Compile a validated config into {platform: ExtractionPlan}"""
+    plans = {}
+
+    platforms = dict(DEFAULT_CONFIG['platforms'])
+    platforms.update(config['platforms'])
+
+    for name, platform in platforms.items():
+        selectors = platform['selectors']
+
+        # Fill gaps from the defaults so the scraper never has to
+        default_selectors = DEFAULT_CONFIG['platforms'].get(name, {}).get('selectors', {})
+        fields = {k: v for k, v in default_selectors.items() if k != 'container'}
+
+        container = selectors['container']
+        if isinstance(container, dict):
+            container = container['selector']
+
+        for key, value in selectors.items():
+            if key != 'container':
+                fields[key] = value
+
+        plans[name] = ExtractionPlan(name, platform.get('url'), container, fields)
+
+    return plans
+
+
+def split_samples(config):
+    """
+    Split bulky inspection samples out of a config.
+    Returns (slim_config, samples) where samples is {platform: {selector: sample_html}}
+    """
+    slim = dict(config)
+    slim['platforms'] = {}
+    samples = {}
+
+    for name, platform in config.get('platforms', {}).items():
+        platform = dict(platform)
+        selectors = dict(platform.get('selectors', {}))
+
+        for key, value in selectors.items():
+            if isinstance(value, dict) and 'sample_html' in value:
+                value = dict(value)
+                samples.setdefault(name, {})[key] = value.pop('sample_html')
+                selectors[key] = value
+
+        platform['selectors'] = selectors
+        slim['platforms'][name] = platform
+
+    return slim, samples
+
+
+def write_json_atomic(filename, data, indent=2):
+    """Write JSON via a temp file + rename so readers never see a partial file"""
+    tmp = f"{filename}.tmp.{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp, filename)
+
+
+class SelectorConfigManager:
+    """
+    Loads selector_config.json, compiles it into per-platform extraction plans
+    and swaps in new plans when the file changes on disk.
+    """
+
+    def __init__(self, config_file='selector_config.json',
+                 samples_file='selector_samples.json', check_interval=1.0):
+        self.config_file = config_file
+        self.samples_file = samples_file
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._hash = None
+        self._last_check = 0.0
+
+        # (config, plans) swapped as one reference
+        self._state = (DEFAULT_CONFIG, compile_config(DEFAULT_CONFIG))
+        self.reload(force=True)
+
+    def reload(self, force=False):
+        """Reload the config if its mtime changed. Returns True if plans were swapped."""
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except FileNotFoundError:
+            if self._mtime is None and force:
+                print(f"⚠️  {self.config_file} not found, using default selectors")
+            return False
+
+        if not force and mtime == self._mtime:
+            return False
+
+        with self._lock:
+            if not force and mtime == self._mtime:
+                return False
+
+            try:
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+            except OSError as e:
+                print(f"⚠️  Could not read {self.config_file}: {e}")
+                return False
+
+            self._mtime = mtime
+            digest = content_hash(raw)
+            if digest == self._hash:
+                return False
+
+            with _PLAN_CACHE_LOCK:
+                cached = _PLAN_CACHE.get(digest)
+
+            if cached is None:
+                try:
+                    config = json.loads(raw)
+                except ValueError as e:
+                    print(f"⚠️  {self.config_file} is not valid JSON ({e}), keeping current selectors")
+                    return False
+
+                # Bad platforms keep their current selectors; the rest still load
+                config, errors = sanitize_config(config, previous=self._state[0])
+                if errors:
+                    print(f"⚠️  Problems in {self.config_file}:")
+                    for error in errors:
+                        print(f"   • {error}")
+                if config is None:
+                    print("   Keeping current selectors")
+                    return False
+
+                config, _ = split_samples(config)
+                cached = (config, compile_config(config))
+                if not errors:
+                    # Partial configs depend on the previous state, so only clean ones are shared
+                    with _PLAN_CACHE_LOCK:
+                        _PLAN_CACHE[digest] = cached
+
+            # Single reference swap - readers see either the old or the new plans
+            self._state = cached
+            self._hash = digest
+
+        print(f"✅ Loaded selectors from {self.config_file}")
+        return True
+
+    def maybe_reload(self):
+        """Cheap mtime check, rate-limited by check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        return self.reload()
+
+    def get_plan(self, platform):
+        """Return the current ExtractionPlan for a platform (None if unknown)"""
+        self.maybe_reload()
+        return self._state[1].get(platform)
+
+    @property
+    def config(self):
+        return self._state[0]
+
+    @property
+    def plans(self):
+        self.maybe_reload()
+        return self._state[1]
+
+    def load_samples(self):
+        """Load inspection samples (not needed on the scraping hot path)"""
+        try:
+            with open(self.samples_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_config(self, config):
+        """
+        Validate and save a config, moving sample_html into the samples file.
+        Broken platforms keep the current selectors (or are left out).
+        Returns the saved slim config, or None if nothing was usable.
+        """
+        config, errors = sanitize_config(config, previous=self.config)
+        if errors:
+            print("⚠️  Problems in the new selector config:")
+            for error in errors:
+                print(f"   • {error}")
+        if config is None:
+            print(f"   {self.config_file} not changed")
+            return None
+
+        slim, samples = split_samples(config)
+
+        if samples:
+            # Platforms that kept their previous selectors keep their samples too
+            merged = self.load_samples()
+            merged.update(samples)
+            write_json_atomic(self.samples_file, merged)
+        write_json_atomic(self.config_file, slim)
+
+        self.reload()
+        return slim
@@ -0,0 +1,243 @@
+"""
+Paginated dashboard data, published together with the serving artifacts.
+
+For every slice (all products, each platform, each platform + category)
+products are sorted by rank and cut into pages, once per projection:
+    full      every field
+    summary   id, rank, title, price
+
+Every record gets a stable id, and a version cursor counts exports that
+added, edited or removed records. changes-<n> lists what changed since
+cursor n (for the last few cursors), so clients can poll for just that.
+
+Artifacts (see serving_artifacts.write_artifacts):
+    pages-index                         slices, page counts, cursor
+    page-<slice>-<projection>-<n>       one page (n starts at 1)
+    changes-<n>                         records changed since cursor n
+"""
+import hashlib
+import json
+import os
+import re
+
+from config_manager import write_json_atomic
+from serving_artifacts import PLATFORM_SLICES, SERVING_DIR, write_artifacts
+
+PAGE_SIZE = 24
+KEEP_CURSORS = 20
+
+PROJECTIONS = {
+    'full': None,
+    'summary': ('id', 'rank', 'title', 'price'),
+}
+
+# Fields that change on every scrape without the product changing
+VOLATILE_FIELDS = ('scrapedAt',)
+
+_ASIN = re.compile(r'/dp/([A-Z0-9]{10})(?=[/?#]|$)')
+# Per-session parts of product links: query/fragment, ref= slots, session ids
+_LINK_NOISE = [
+    re.compile(r'[?#].*$'),
+    re.compile(r'/ref=[^/]*'),
+    re.compile(r'/\d{3}-\d{7}-\d{7}'),
+    re.compile(r'/+$'),
+]
+
+_PLATFORM_SLUGS = {label: slug for slug, label in PLATFORM_SLICES.items()}
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text or 'other').lower()).strip('-') or 'other'
+
+
+def platform_slug(platform):
+    return _PLATFORM_SLUGS.get(platform) or slugify(platform)
+
+
+def canonical_link(link):
+    """Link without per-session noise; Amazon products reduce to their ASIN"""
+    if not link:
+        return link
+    match = _ASIN.search(link)
+    if match:
+        return f"asin:{match.group(1)}"
+    for pattern in _LINK_NOISE:
+        link = pattern.sub('', link)
+    return link
+
+
+def record_id(product):
+    """Stable id: platform + canonical link (title if there is no link)"""
+    key = f"{product.get('platform')}|{canonical_link(product.get('link')) or product.get('title')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+
+def record_digest(record):
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    if stable.get('link'):
+        stable['link'] = canonical_link(stable['link'])
+    return hashlib.sha1(json.dumps(stable, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def with_ids(products):
+    """Copies of the products with an 'id' field; duplicates get a suffix"""
+    records = []
+    seen = set()
+    for product in products:
+        base = record_id(product)
+        rid, n = base, 1
+        while rid in seen:
+            n += 1
+            rid = f"{base}-{n}"
+        seen.add(rid)
+        records.append({'id': rid, **product})
+    return records
+
+
+def project(record, fields):
+    if fields is None:
+        return record
+    return {f: record[f] for f in fields if f in record}
+
+
+def build_slices(records):
+    """{slice: (platform, category, sorted records)}"""
+    platform_order = {}
+    for record in records:
+        platform_order.setdefault(record.get('platform'), len(platform_order))
+
+    def rank_key(item):
+        index, record = item
+        rank = record.get('rank')
+        return (platform_order[record.get('platform')],
+                rank if isinstance(rank, (int, float)) else float('inf'), index)
+
+    ordered = [record for _, record in sorted(enumerate(records), key=rank_key)]
+
+    slices = {'all': (None, None, ordered)}
+    for record in ordered:
+        platform = record.get('platform')
+        slug = platform_slug(platform)
+        slices.setdefault(slug, (platform, None, []))[2].append(record)
+        category = record.get('category')
+        if category:
+            slices.setdefault(f"{slug}.{slugify(category)}", (platform, category, []))[2].append(record)
+    return slices
+
+
+class PageBuilder:
+    """Builds page/changes artifacts and keeps the cursor state between exports"""
+
+    def __init__(self, state_file=None, page_size=PAGE_SIZE):
+        self.state_file = state_file or os.path.join(SERVING_DIR, 'cursor_state.json')
+        self.page_size = page_size
+        self.state = self.load_state()
+        self._pending = None
+
+    def load_state(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'cursor': 0, 'records': {}, 'history': []}
+
+    def _advance(self, records):
+        """New cursor state for this export (not saved until commit())"""
+        digests = {r['id']: record_digest(r) for r in records}
+        previous = self.state.get('records', {})
+        changed = sorted(rid for rid in set(digests) | set(previous)
+                         if digests.get(rid) != previous.get(rid))
+
+        cursor = self.state.get('cursor', 0)
+        history = list(self.state.get('history', []))
+        if changed or not cursor:
+            cursor += 1
+            history = (history + [{'cursor': cursor, 'changed': changed}])[-KEEP_CURSORS:]
+        return {'cursor': cursor, 'records': digests, 'history': history}
+
+    def _changes(self, state, by_id, last_update):
+        """changes-<n> payloads for every cursor n the history can answer"""
+        history = state['history']
+        oldest = history[0]['cursor'] - 1 if history else state['cursor']
+        payloads = {}
+        for since in range(oldest, state['cursor'] + 1):
+            ids = set()
+            for entry in history:
+                if entry['cursor'] > since:
+                    ids.update(entry['changed'])
+            payloads[f'changes-{since}'] = {
+                'success': True,
+                'since': since,
+                'cursor': state['cursor'],
+                'upserted': [by_id[rid] for rid in sorted(ids) if rid in by_id],
+                'removed': sorted(rid for rid in ids if rid not in by_id),
+                'lastUpdate': last_update
+            }
+        return payloads
+
+    def build(self, data):
+        """{artifact name: payload} for pages, the index and change lists"""
+        records = with_ids(data.get('products', []))
+        last_update = data.get('lastUpdate')
+        state = self._advance(records)
+        cursor = state['cursor']
+
+        artifacts = {}
+        index = {
+            'success': True,
+            'cursor': cursor,
+            'lastUpdate': last_update,
+            'pageSize': self.page_size,
+            'sort': 'rank',
+            'projections': {name: list(fields) if fields else None for name, fields in PROJECTIONS.items()},
+            'slices': {}
+        }
+
+        for name, (platform, category, items) in build_slices(records).items():
+            pages = max(1, -(-len(items) // self.page_size))
+            index['slices'][name] = {
+                'platform': platform,
+                'category': category,
+                'count': len(items),
+                'pages': pages
+            }
+            for page in range(1, pages + 1):
+                chunk = items[(page - 1) * self.page_size:page * self.page_size]
+                for projection, fields in PROJECTIONS.items():
+                    artifacts[f'page-{name}-{projection}-{page}'] = {
+                        'success': True,
+                        'slice': name,
+                        'platform': platform,
+                        'category': category,
+                        'projection': projection,
+                        'page': page,
+                        'pages': pages,
+                        'pageSize': self.page_size,
+                        'count': len(items),
+                        'cursor': cursor,
+                        'lastUpdate': last_update,
+                        'products': [project(r, fields) for r in chunk]
+                    }
+
+        changes = self._changes(state, {r['id']: r for r in records}, last_update)
+        index['changesSince'] = sorted(int(name.split('-', 1)[1]) for name in changes)
+        artifacts.update(changes)
+        artifacts['pages-index'] = index
+
+        self._pending = state
+        return artifacts
+
+    def commit(self):
+        """Make the built cursor state current (after the artifacts are published)"""
+        if self._pending is None:
+            return
+        self.state, self._pending = self._pending, None
+        write_json_atomic(self.state_file, self.state)
+
+
+def publish(data, serving_dir=SERVING_DIR, page_size=PAGE_SIZE):
+    """write_artifacts() plus dashboard pages; returns the manifest"""
+    builder = PageBuilder(os.path.join(serving_dir, 'cursor_state.json'), page_size)
+    manifest = write_artifacts(data, serving_dir, extra=builder.build(data))
+    builder.commit()
+    return manifest
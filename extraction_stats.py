@@ -0,0 +1,150 @@
+"""
+Per-platform, per-field statistics for extraction strategies.
+
+The scraper tries several strategies for a field (e.g. title from img alt,
+link aria-label, span text). We record which one succeeds and what it
+costs, persist that to extraction_stats.json and order strategies by
+expected cost per hit on later runs. Strategies that practically never hit
+drop off the hot path; the first lookup of each field in a run uses the
+default order (dropped strategies included) so they can recover.
+
+Usage: python extraction_stats.py   (prints the report)
+"""
+import json
+import threading
+
+from config_manager import write_json_atomic
+
+STATS_FILE = 'extraction_stats.json'
+
+MIN_SAMPLES = 5        # attempts before a strategy is ranked by its stats
+DROP_HIT_RATE = 0.02   # below this (with enough samples) a strategy is skipped
+DROP_MIN_SAMPLES = 50
+WINDOW = 500           # halve counters past this, so layout changes win quickly
+
+
+def _empty():
+    return {'attempts': 0, 'hits': 0, 'seconds': 0.0}
+
+
+class StrategyStats:
+    def __init__(self, stats_file=STATS_FILE):
+        """stats_file=None keeps stats in memory for this run only"""
+        self.stats_file = stats_file
+        self.stats = self.load()
+        self._delta = {}
+        self._explored = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.stats_file:
+            return {}
+        try:
+            with open(self.stats_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _entry(self, stats, platform, field, strategy):
+        return stats.setdefault(platform, {}).setdefault(field, {}).setdefault(strategy, _empty())
+
+    def order(self, platform, field, strategies):
+        """
+        Return strategy names, cheapest expected cost per hit first.
+        Strategies without enough samples keep their default position;
+        the ones with samples are ranked among the remaining slots.
+        """
+        key = (platform, field)
+        if key not in self._explored:
+            self._explored.add(key)
+            return list(strategies)
+        return self.ranked(platform, field, strategies)
+
+    def ranked(self, platform, field, strategies):
+        """The learned order, without the once-per-run exploration pass"""
+        field_stats = self.stats.get(platform, {}).get(field, {})
+        slots = []
+        ranked = []
+        dropped = []
+        for index, name in enumerate(strategies):
+            s = field_stats.get(name, _empty())
+            if s['attempts'] < MIN_SAMPLES:
+                slots.append(name)
+                continue
+            hit_rate = s['hits'] / s['attempts']
+            if hit_rate < DROP_HIT_RATE and s['attempts'] >= DROP_MIN_SAMPLES:
+                dropped.append(name)
+                continue
+            cost = s['seconds'] / s['attempts']
+            ranked.append((cost / hit_rate if hit_rate else float('inf'), index, name))
+            slots.append(None)
+
+        if not slots:
+            # Never leave a field without a strategy
+            return dropped
+
+        ranked = iter(name for _, _, name in sorted(ranked))
+        return [name if name is not None else next(ranked) for name in slots]
+
+    def record(self, platform, field, strategy, success, seconds):
+        """Record one attempt"""
+        with self._lock:
+            for stats in (self.stats, self._delta):
+                entry = self._entry(stats, platform, field, strategy)
+                entry['attempts'] += 1
+                entry['hits'] += 1 if success else 0
+                entry['seconds'] += seconds
+
+    def save(self):
+        """Merge this run's attempts into the stats file"""
+        with self._lock:
+            if not self._delta or not self.stats_file:
+                return
+            merged = self.load()
+            for platform, fields in self._delta.items():
+                for field, strategies in fields.items():
+                    for strategy, delta in strategies.items():
+                        entry = self._entry(merged, platform, field, strategy)
+                        for k in ('attempts', 'hits', 'seconds'):
+                            entry[k] += delta[k]
+                        if entry['attempts'] > WINDOW:
+                            entry['attempts'] = entry['attempts'] // 2
+                            entry['hits'] = entry['hits'] // 2
+                            entry['seconds'] = entry['seconds'] / 2
+                        entry['seconds'] = round(entry['seconds'], 4)
+            self._delta = {}
+            self.stats = merged
+            try:
+                write_json_atomic(self.stats_file, merged)
+            except OSError as e:
+                print(f"⚠️  Could not save extraction stats: {e}")
+
+    def report(self):
+        """Print hit rate and cost per strategy"""
+        if not self.stats:
+            print("📊 No extraction stats recorded yet")
+            return
+
+        for platform, fields in self.stats.items():
+            print("\n" + "=" * 70)
+            print(f"📊 EXTRACTION STRATEGIES - {platform}")
+            print("=" * 70)
+            for field, strategies in fields.items():
+                order = self.ranked(platform, field, list(strategies))
+                print(f"\n🔹 {field.upper()} (current order: {' → '.join(order) or 'none'})")
+                for name, s in strategies.items():
+                    attempts = s['attempts'] or 1
+                    hit_rate = s['hits'] / attempts
+                    cost_ms = 1000 * s['seconds'] / attempts
+                    per_hit = f"{1000 * s['seconds'] / s['hits']:.1f} ms/hit" if s['hits'] else "never hits"
+                    status = "✅" if name in order else "⏭️ "
+                    print(f"   {status} {name:<16} {hit_rate:6.1%} hit  {cost_ms:7.1f} ms/try  "
+                          f"{per_hit}  ({s['attempts']} tries)")
+
+
+def main():
+    StrategyStats().report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Tiny offline DOM built on html.parser with a CSS selector subset.
+
+Supports what our inspectors use: tag, *, .class, #id, [attr], [attr=v],
+[attr*=v], [attr^=v], [attr$=v], [attr~=v], descendant and child (>)
+combinators, and selector groups (a, b).
+"""
+import re
+from html.parser import HTMLParser
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+SKIP_TEXT_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+class Node:
+    """An element in the parsed document"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'texts', 'classes')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+        self.texts = []
+        self.classes = frozenset(self.attrs.get('class', '').split())
+
+    def get_attribute(self, name):
+        """Same spirit as WebElement.get_attribute"""
+        return self.attrs.get(name)
+
+    @property
+    def text(self):
+        """Whitespace-normalized text content"""
+        parts = []
+        self._collect_text(parts)
+        return ' '.join(' '.join(parts).split())
+
+    def _collect_text(self, parts):
+        if self.tag in SKIP_TEXT_TAGS:
+            return
+        parts.extend(self.texts)
+        for child in self.children:
+            child._collect_text(parts)
+
+    def iter(self):
+        """Yield all descendants in document order (not self)"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def select(self, selector):
+        """Return all descendants matching a CSS selector"""
+        return select(self, selector)
+
+    def select_one(self, selector):
+        """Return the first matching descendant or None"""
+        return select_one(self, selector)
+
+    def __repr__(self):
+        return f"<{self.tag} {self.attrs}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v if v is not None else '') for k, v in attrs}
+        node = Node(tag, attrs, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        attrs = {k: (v if v is not None else '') for k, v in attrs}
+        node = Node(tag, attrs, self.stack[-1])
+        self.stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the nearest matching open tag, ignore stray end tags
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if data.strip():
+            self.stack[-1].texts.append(data)
+
+
+def parse_html(html):
+    """Parse an HTML string into a Node tree"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# ---------------------------------------------------------------------------
+# Selectors
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s*>\s*|\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \.(?P<cls>[\w-]+)
+  | \#(?P<id>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+''', re.VERBOSE)
+
+_compiled = {}
+
+
+class _Compound:
+    __slots__ = ('tag', 'classes', 'id', 'attrs')
+
+    def __init__(self):
+        self.tag = None
+        self.classes = []
+        self.id = None
+        self.attrs = []
+
+    def matches(self, node):
+        if self.tag and node.tag != self.tag:
+            return False
+        if self.id is not None and node.attrs.get('id') != self.id:
+            return False
+        for cls in self.classes:
+            if cls not in node.classes:
+                return False
+        for name, op, value in self.attrs:
+            actual = node.attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and value not in actual:
+                return False
+            if op == '^=' and not actual.startswith(value):
+                return False
+            if op == '$=' and not actual.endswith(value):
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+        return True
+
+
+def _compile_one(selector):
+    """Compile one selector into [(combinator, compound), ...] left to right"""
+    steps = []
+    compound = None
+    combinator = ' '
+    pos = 0
+    selector = selector.strip()
+
+    while pos < len(selector):
+        m = _TOKEN_RE.match(selector, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Unsupported selector syntax: {selector!r} at {pos}")
+        pos = m.end()
+
+        if m.group('ws') is not None:
+            if compound is not None:
+                steps.append((combinator, compound))
+                compound = None
+            combinator = '>' if '>' in m.group('ws') else ' '
+            continue
+
+        if compound is None:
+            compound = _Compound()
+
+        if m.group('tag'):
+            if m.group('tag') != '*':
+                compound.tag = m.group('tag').lower()
+        elif m.group('cls'):
+            compound.classes.append(m.group('cls'))
+        elif m.group('id'):
+            compound.id = m.group('id')
+        else:
+            value = m.group('dq')
+            if value is None:
+                value = m.group('sq')
+            if value is None:
+                value = m.group('bare')
+            compound.attrs.append((m.group('attr'), m.group('op'), value))
+
+    if compound is None:
+        raise ValueError(f"Empty selector: {selector!r}")
+    steps.append((combinator, compound))
+    return steps
+
+
+def compile_selector(selector):
+    """Compile (and cache) a selector group"""
+    compiled = _compiled.get(selector)
+    if compiled is None:
+        compiled = [_compile_one(part) for part in selector.split(',')]
+        _compiled[selector] = compiled
+    return compiled
+
+
+def _matches_steps(node, steps, index):
+    # Right-to-left like browsers; ancestors may sit outside the search root,
+    # matching element.querySelectorAll semantics
+    combinator, compound = steps[index]
+    if not compound.matches(node):
+        return False
+    if index == 0:
+        return True
+
+    parent = node.parent
+    if combinator == '>':
+        return parent is not None and _matches_steps(parent, steps, index - 1)
+
+    while parent is not None:
+        if _matches_steps(parent, steps, index - 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+def matches(node, selector):
+    """True if node matches the selector"""
+    return any(_matches_steps(node, steps, len(steps) - 1)
+               for steps in compile_selector(selector))
+
+
+def select(root, selector):
+    """All descendants of root matching selector, in document order"""
+    groups = compile_selector(selector)
+    results = []
+    for node in root.iter():
+        for steps in groups:
+            if _matches_steps(node, steps, len(steps) - 1):
+                results.append(node)
+                break
+    return results
+
+
+def select_one(root, selector):
+    """First descendant of root matching selector, or None"""
+    groups = compile_selector(selector)
+    for node in root.iter():
+        for steps in groups:
+            if _matches_steps(node, steps, len(steps) - 1):
+                return node
+    return None
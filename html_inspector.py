@@ -2,8 +2,10 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
-import json
 from datetime import datetime
+from config_manager import SelectorConfigManager
+from selector_candidates import AMAZON_CANDIDATES, PRODUCT_HUNT_CANDIDATES
+from browser_watchdog import watchdog
 
 def setup_driver(headless=False):
     """Setup Chrome driver with anti-detection"""
@@ -17,43 +19,40 @@ def setup_driver(headless=False):
     options.add_argument('--no-sandbox')
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     
-    return webdriver.Chrome(options=options)
+    driver = webdriver.Chrome(options=options)
+    watchdog.register(driver, 'inspector')
+    return driver
 
-def inspect_amazon():
+AMAZON_URL = "https://www.amazon.com/Best-Sellers/zgbs"
+PRODUCT_HUNT_URL = "https://www.producthunt.com/"
+
+def inspect_amazon(url=AMAZON_URL, headless=False, interactive=True, page_wait=5):
     """Inspect Amazon and find working selectors"""
     print("=" * 70)
     print("🔍 AMAZON BEST SELLERS - HTML INSPECTOR")
     print("=" * 70)
     
-    driver = setup_driver(headless=False)
+    driver = setup_driver(headless=headless)
     results = {
         'platform': 'Amazon',
-        'url': 'https://www.amazon.com/Best-Sellers/zgbs',
+        'url': url,
         'inspectedAt': datetime.now().isoformat(),
         'selectors': {}
     }
     
     try:
-        url = "https://www.amazon.com/Best-Sellers/zgbs"
         print(f"\n📍 Loading: {url}")
         driver.get(url)
         
-        print("⏳ Waiting 5 seconds for page to load...")
-        time.sleep(5)
+        print(f"⏳ Waiting {page_wait} seconds for page to load...")
+        time.sleep(page_wait)
         
         print("\n" + "=" * 70)
         print("🔎 TESTING PRODUCT CONTAINER SELECTORS")
         print("=" * 70)
         
         # Test different container selectors
-        container_selectors = [
-            '.p13n-sc-uncoverable-faceout',
-            '[data-asin]',
-            '.zg-carousel-general-faceout',
-            '.zg-grid-general-faceout',
-            '.zg-item-immersion',
-            'div[id][class*="p13n"]'
-        ]
+        container_selectors = AMAZON_CANDIDATES['container']
         
         best_container = None
         max_elements = 0
@@ -92,13 +91,7 @@ def inspect_amazon():
             containers = driver.find_elements(By.CSS_SELECTOR, best_container)[:3]  # Test first 3
             
             # Test title selectors
-            title_selectors = [
-                'span.aok-inline-block',
-                '.p13n-sc-truncate',
-                'span[class*="truncate"]',
-                'div[class*="title"]',
-                'img[alt]'  # Sometimes title is in image alt
-            ]
+            title_selectors = AMAZON_CANDIDATES['title']
             
             print("\n📝 TITLE SELECTORS:")
             for selector in title_selectors:
@@ -118,12 +111,7 @@ def inspect_amazon():
                     results['selectors']['title'] = selector
             
             # Test price selectors
-            price_selectors = [
-                '.a-price .a-offscreen',
-                '.p13n-sc-price',
-                'span[class*="price"]',
-                '.a-price-whole'
-            ]
+            price_selectors = AMAZON_CANDIDATES['price']
             
             print("\n💰 PRICE SELECTORS:")
             for selector in price_selectors:
@@ -168,50 +156,44 @@ def inspect_amazon():
         print("📊 AMAZON INSPECTION COMPLETE")
         print("=" * 70)
         
-        input("\n⏸️  Press Enter to close browser and continue...")
+        if interactive:
+            input("\n⏸️  Press Enter to close browser and continue...")
         
     except Exception as e:
         print(f"\n❌ Error during inspection: {e}")
     finally:
-        driver.quit()
+        watchdog.quit(driver)
     
     return results
 
-def inspect_product_hunt():
+def inspect_product_hunt(url=PRODUCT_HUNT_URL, headless=False, interactive=True, page_wait=5):
     """Inspect Product Hunt and find working selectors"""
     print("\n\n")
     print("=" * 70)
     print("🔍 PRODUCT HUNT - HTML INSPECTOR")
     print("=" * 70)
     
-    driver = setup_driver(headless=False)
+    driver = setup_driver(headless=headless)
     results = {
         'platform': 'Product Hunt',
-        'url': 'https://www.producthunt.com/',
+        'url': url,
         'inspectedAt': datetime.now().isoformat(),
         'selectors': {}
     }
     
     try:
-        url = "https://www.producthunt.com/"
         print(f"\n📍 Loading: {url}")
         driver.get(url)
         
-        print("⏳ Waiting 5 seconds for page to load...")
-        time.sleep(5)
+        print(f"⏳ Waiting {page_wait} seconds for page to load...")
+        time.sleep(page_wait)
         
         print("\n" + "=" * 70)
         print("🔎 TESTING PRODUCT CONTAINER SELECTORS")
         print("=" * 70)
         
         # Test different container selectors
-        container_selectors = [
-            'article',
-            'div[data-test*="post"]',
-            '[class*="Post"]',
-            'div[class*="item"]',
-            'section article'
-        ]
+        container_selectors = PRODUCT_HUNT_CANDIDATES['container']
         
         best_container = None
         max_elements = 0
@@ -248,13 +230,7 @@ def inspect_product_hunt():
             containers = driver.find_elements(By.CSS_SELECTOR, best_container)[:5]
             
             # Test title selectors
-            title_selectors = [
-                'h3',
-                'h2',
-                'h1',
-                'a[href*="/posts/"]',
-                '[class*="title"]'
-            ]
+            title_selectors = PRODUCT_HUNT_CANDIDATES['title']
             
             print("\n📝 TITLE SELECTORS:")
             for selector in title_selectors:
@@ -275,7 +251,7 @@ def inspect_product_hunt():
             
             # Test description
             print("\n📄 DESCRIPTION SELECTORS:")
-            desc_selectors = ['p', 'span[class*="tagline"]', 'div[class*="description"]']
+            desc_selectors = PRODUCT_HUNT_CANDIDATES['description']
             for selector in desc_selectors:
                 found_count = 0
                 for container in containers:
@@ -307,12 +283,13 @@ def inspect_product_hunt():
         print("📊 PRODUCT HUNT INSPECTION COMPLETE")
         print("=" * 70)
         
-        input("\n⏸️  Press Enter to close browser...")
+        if interactive:
+            input("\n⏸️  Press Enter to close browser...")
         
     except Exception as e:
         print(f"\n❌ Error during inspection: {e}")
     finally:
-        driver.quit()
+        watchdog.quit(driver)
     
     return results
 
@@ -326,11 +303,13 @@ def save_results(amazon_results, ph_results):
         }
     }
     
-    with open('selector_config.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Selectors go to selector_config.json, sample HTML to selector_samples.json
+    if SelectorConfigManager().save_config(data) is None:
+        print("\n❌ No usable selectors found, selector_config.json not changed")
+        return
     
     print("\n" + "=" * 70)
-    print("💾 RESULTS SAVED TO: selector_config.json")
+    print("💾 RESULTS SAVED TO: selector_config.json (samples: selector_samples.json)")
     print("=" * 70)
     print("\nUse this file to update your scraper automatically!")
 
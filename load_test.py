@@ -0,0 +1,517 @@
+"""
+Local load-test harness.
+
+Starts a stand-in site that serves generated Amazon bestseller and Product
+Hunt-style pages (built from the markup captured in selector_samples.json),
+with injected latency, error pages and lazy-loaded tiles, then drives the
+scraper/inspector against it at increasing concurrency levels.
+
+Modes:
+    http       plain HTTP fetch + offline extraction (no browser needed)
+    scraper    ProductScraper.scrape_amazon_bestsellers via Chrome
+    inspector  html_inspector.inspect_amazon / inspect_product_hunt via Chrome
+
+Usage: python load_test.py --mode http --levels 1,2,4,8 --pages 200 --latency 0.2 --error-rate 0.05
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config_manager import SelectorConfigManager
+from html_dom import parse_html
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+# 1x1 transparent GIF for product images
+PIXEL_GIF = (b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00'
+             b'\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;')
+
+DEFAULT_ERROR_HTML = '<div><h2>512</h2><h1>Oops, something went wrong on our end</h1></div>'
+
+WORDS = ['Wireless', 'Earbuds', 'Smart', 'Plug', 'Echo', 'Kindle', 'Charger', 'Cable',
+         'Stand', 'Speaker', 'Camera', 'Blink', 'Fire', 'Stick', 'Water', 'Bottle']
+
+
+# ---------------------------------------------------------------------------
+# Stand-in site
+# ---------------------------------------------------------------------------
+
+class SiteSettings:
+    """Knobs for the stand-in site"""
+
+    def __init__(self, products=30, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 lazy_ratio=0.0, lazy_delay=0.5, seed=None):
+        self.products = products
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.lazy_ratio = lazy_ratio
+        self.lazy_delay = lazy_delay
+        self.random = random.Random(seed)
+
+
+class _Server(ThreadingHTTPServer):
+    # Default backlog of 5 turns high concurrency into 1s SYN retries
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StandInSite:
+    """Threaded HTTP server mimicking the pages we scrape"""
+
+    def __init__(self, settings=None, host='127.0.0.1', port=0):
+        self.settings = settings or SiteSettings()
+        self.samples = SelectorConfigManager().load_samples()
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _Server((host, port), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def amazon_url(self):
+        return f"{self.base_url}/Best-Sellers/zgbs"
+
+    @property
+    def product_hunt_url(self):
+        return f"{self.base_url}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"🌐 Stand-in site running at {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # -- markup ----------------------------------------------------------------
+
+    def _sample(self, platform, key='container', default=''):
+        return self.samples.get(platform, {}).get(key, default)
+
+    def _amazon_tile(self, i):
+        asin = f"B0STAND{i:03d}"
+        title = ' '.join(WORDS[(i * 7 + k) % len(WORDS)] for k in range(6))
+        price = f"${(i * 13) % 200 + 9}.99"
+        return (
+            f'<div id="gridItemRoot"><div class="zg-grid-general-faceout">'
+            f'<div id="{asin}" data-asin="{asin}" class="p13n-sc-uncoverable-faceout">'
+            f'<a class="a-link-normal" href="{self.base_url}/{title.replace(" ", "-")}/dp/{asin}">'
+            f'<img alt="{title}" src="{self.base_url}/img/{i}.gif"></a>'
+            f'<a class="a-link-normal" href="{self.base_url}/dp/{asin}">'
+            f'<div class="_cDEzb_p13n-sc-css-line-clamp-3 p13n-sc-truncate">{title}</div></a>'
+            f'<span class="p13n-sc-price">{price}</span>'
+            f'</div></div></div>'
+        )
+
+    def _product_hunt_item(self, i):
+        name = f"{WORDS[i % len(WORDS)]} {WORDS[(i * 3 + 1) % len(WORDS)]} AI"
+        slug = name.lower().replace(' ', '-')
+        return (
+            f'<section><article data-test="post-item-{i}" class="styles_item">'
+            f'<img src="{self.base_url}/img/{i}.gif" alt="{name}">'
+            f'<h3>{name}</h3><p>The best {name.lower()} for teams</p>'
+            f'<a href="{self.base_url}/posts/{slug}">{name}</a>'
+            f'</article></section>'
+        )
+
+    def _page(self, title, banner, items, lazy_query):
+        lazy = ''
+        if lazy_query:
+            # Tiles that only appear after client-side JS runs, like infinite scroll
+            lazy = (
+                '<div id="lazy-root"></div><script>'
+                f'setTimeout(function(){{fetch("/lazy?{lazy_query}").then(function(r){{return r.text()}})'
+                '.then(function(h){document.getElementById("lazy-root").innerHTML=h})}}, '
+                f'{int(self.settings.lazy_delay * 1000)});</script>'
+            )
+        return (
+            f'<!DOCTYPE html><html><head><title>{title}</title></head><body>'
+            f'{banner}<div class="p13n-gridRow">{"".join(items)}</div>{lazy}</body></html>'
+        )
+
+    def render(self, platform, start=0, count=None):
+        """Render a page (or lazy fragment when start > 0)"""
+        s = self.settings
+        count = s.products if count is None else count
+        tile = self._amazon_tile if platform == 'amazon' else self._product_hunt_item
+
+        if start:
+            return ''.join(tile(i) for i in range(start, start + count))
+
+        eager = count - int(count * s.lazy_ratio)
+        items = [tile(i) for i in range(eager)]
+        lazy_query = f"platform={platform}&start={eager}&count={count - eager}" if eager < count else ''
+
+        if platform == 'amazon':
+            return self._page('Amazon.com Best Sellers', self._sample('amazon'), items, lazy_query)
+        return self._page('Product Hunt', '', items, lazy_query)
+
+    # -- request handling ------------------------------------------------------
+
+    def handle(self, request):
+        s = self.settings
+        with self._lock:
+            self.requests += 1
+            delay = s.latency + s.random.uniform(0, s.latency_jitter)
+            fail = s.random.random() < s.error_rate
+
+        url = urlparse(request.path)
+        query = parse_qs(url.query)
+
+        if url.path.startswith('/img/'):
+            return self._send(request, 200, PIXEL_GIF, 'image/gif')
+
+        if delay:
+            time.sleep(delay)
+
+        if url.path == '/stats':
+            body = json.dumps({'requests': self.requests, 'errors': self.errors})
+            return self._send(request, 200, body, 'application/json')
+
+        if fail and url.path != '/lazy':
+            with self._lock:
+                self.errors += 1
+            # The error page Product Hunt actually served during inspection
+            body = self._sample('productHunt', default=DEFAULT_ERROR_HTML)
+            return self._send(request, 500, f'<html><body>{body}</body></html>')
+
+        if url.path == '/Best-Sellers/zgbs':
+            return self._send(request, 200, self.render('amazon'))
+        if url.path in ('/', '/producthunt'):
+            return self._send(request, 200, self.render('productHunt'))
+        if url.path == '/lazy':
+            platform = query.get('platform', ['amazon'])[0]
+            start = int(query.get('start', ['1'])[0])
+            count = int(query.get('count', ['0'])[0])
+            return self._send(request, 200, self.render(platform, start, count))
+
+        return self._send(request, 404, '<h1>Not found</h1>')
+
+    def _send(self, request, status, body, content_type='text/html; charset=utf-8'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        try:
+            request.send_response(status)
+            request.send_header('Content-Type', content_type)
+            request.send_header('Content-Length', str(len(body)))
+            request.end_headers()
+            request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Workloads: each returns a callable that loads and extracts one page
+# ---------------------------------------------------------------------------
+
+def http_workload(site, platform='amazon'):
+    """Fetch + extract with the offline DOM (measures site + parse cost)"""
+    plan = SelectorConfigManager().get_plan(platform)
+    url = site.amazon_url if platform == 'amazon' else site.product_hunt_url
+
+    def setup():
+        return None
+
+    def run(_):
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                html = response.read().decode('utf-8', errors='replace')
+        except urllib.error.HTTPError:
+            return 0
+        containers = parse_html(html).select(plan.container)
+        return len(containers)
+
+    def teardown(_):
+        pass
+
+    return setup, run, teardown
+
+
+def scraper_workload(site, page_wait=1, limit=30):
+    """One ProductScraper (one Chrome) per worker thread"""
+    from scraper import ProductScraper
+
+    def setup():
+        # Stand-in pages must not train the production strategy order
+        return ProductScraper(headless=True, amazon_url=site.amazon_url, page_wait=page_wait,
+                              stats_file=None)
+
+    def run(scraper):
+        return len(scraper.scrape_amazon_bestsellers(limit))
+
+    def teardown(scraper):
+        scraper.close()
+
+    return setup, run, teardown
+
+
+def inspector_workload(site, page_wait=1):
+    """A full headless inspection cycle per task (starts its own Chrome)"""
+    from html_inspector import inspect_amazon, inspect_product_hunt
+
+    def setup():
+        return None
+
+    def run(_):
+        amazon = inspect_amazon(site.amazon_url, headless=True, interactive=False, page_wait=page_wait)
+        ph = inspect_product_hunt(site.product_hunt_url, headless=True, interactive=False, page_wait=page_wait)
+        return len(amazon['selectors']) + len(ph['selectors'])
+
+    def teardown(_):
+        pass
+
+    return setup, run, teardown
+
+
+WORKLOADS = {
+    'http': http_workload,
+    'scraper': scraper_workload,
+    'inspector': inspector_workload
+}
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def cpu_seconds():
+    """CPU time of this process and its reaped children (process only without resource)"""
+    if resource is None:
+        return time.process_time()
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+class ResourceSampler:
+    """
+    Samples RSS of this process and its children (Chrome) while a level runs.
+    Needs psutil for that; without it only this process's lifetime peak
+    (ru_maxrss) is known, and rss_scope says so.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak_rss_mb = 0.0
+        if psutil is not None:
+            self.rss_scope = 'process+children'
+        elif resource is not None:
+            self.rss_scope = 'lifetime peak'
+        else:
+            self.rss_scope = 'unavailable'
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _rss_mb(self):
+        if psutil is None:
+            if resource is None:
+                return 0.0
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # KB on Linux, bytes on macOS
+            return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+        proc = psutil.Process()
+        total = 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss_mb = max(self.peak_rss_mb, self._rss_mb())
+
+    def __enter__(self):
+        self.peak_rss_mb = self._rss_mb()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss_mb = max(self.peak_rss_mb, self._rss_mb())
+
+
+def run_level(workload, concurrency, pages):
+    """Run `pages` tasks over `concurrency` workers; return a result row"""
+    setup, run, teardown = workload
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+    remaining = [pages]
+
+    def worker():
+        nonlocal failures
+        state = setup()
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    ok = run(state) > 0
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    if not ok:
+                        failures += 1
+        finally:
+            teardown(state)
+
+    cpu_before = cpu_seconds()
+
+    with ResourceSampler() as sampler:
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        wall = time.perf_counter() - wall_start
+
+    cpu = cpu_seconds() - cpu_before
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'pages': len(latencies),
+        'failures': failures,
+        'seconds': round(wall, 3),
+        'pagesPerSecond': round(len(latencies) / wall, 2) if wall else 0.0,
+        'p50': round(percentile(latencies, 50), 4),
+        'p95': round(percentile(latencies, 95), 4),
+        'p99': round(percentile(latencies, 99), 4),
+        'cpuSeconds': round(cpu, 2),
+        'peakRssMb': round(sampler.peak_rss_mb, 1),
+        'rssScope': sampler.rss_scope
+    }
+
+
+def print_results(rows):
+    print("\n" + "=" * 70)
+    print("📊 LOAD TEST RESULTS")
+    print("=" * 70)
+    print(f"{'conc':>5} {'pages':>6} {'fail':>5} {'pages/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'cpu s':>7} {'rss MB':>8}")
+    for r in rows:
+        print(f"{r['concurrency']:>5} {r['pages']:>6} {r['failures']:>5} {r['pagesPerSecond']:>8.2f} "
+              f"{r['p50']:>8.3f} {r['p95']:>8.3f} {r['p99']:>8.3f} {r['cpuSeconds']:>7.2f} {r['peakRssMb']:>8.1f}")
+    scope = rows[0]['rssScope'] if rows else None
+    if scope == 'unavailable':
+        print("   rss MB: not measured (pip install psutil)")
+    elif scope and scope != 'process+children':
+        print(f"   rss MB: {scope} of this process only (pip install psutil to include Chrome)")
+    print("=" * 70)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the scraper against a local stand-in site')
+    parser.add_argument('--mode', choices=list(WORKLOADS), default='http')
+    parser.add_argument('--levels', default='1,2,4,8', help='Comma-separated concurrency levels')
+    parser.add_argument('--pages', type=int, default=100, help='Pages per level')
+    parser.add_argument('--products', type=int, default=30, help='Products per page')
+    parser.add_argument('--latency', type=float, default=0.1, help='Base response latency (s)')
+    parser.add_argument('--latency-jitter', type=float, default=0.05, help='Extra random latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of pages served as the 512 error page')
+    parser.add_argument('--lazy-ratio', type=float, default=0.0, help='Share of tiles loaded by JS after the page')
+    parser.add_argument('--lazy-delay', type=float, default=0.5, help='Delay before lazy tiles load (s)')
+    parser.add_argument('--page-wait', type=float, default=1.0, help='Browser wait per page (scraper/inspector)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--report', default=None, help='Write results to this JSON file')
+    parser.add_argument('--serve', action='store_true', help='Only run the stand-in site until Ctrl+C')
+    args = parser.parse_args(argv)
+
+    if args.mode != 'http' and psutil is None and not args.serve:
+        parser.error(f"--mode {args.mode} measures Chrome memory and needs psutil (pip install psutil)")
+
+    settings = SiteSettings(products=args.products, latency=args.latency,
+                            latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                            lazy_ratio=args.lazy_ratio, lazy_delay=args.lazy_delay, seed=args.seed)
+    site = StandInSite(settings).start()
+
+    try:
+        if args.serve:
+            print(f"   Amazon: {site.amazon_url}")
+            print(f"   Product Hunt: {site.product_hunt_url}")
+            print("💡 Press Ctrl+C to stop")
+            while True:
+                time.sleep(3600)
+
+        if args.mode == 'http':
+            workload = http_workload(site)
+        elif args.mode == 'scraper':
+            workload = scraper_workload(site, page_wait=args.page_wait, limit=args.products)
+        else:
+            workload = inspector_workload(site, page_wait=args.page_wait)
+
+        rows = []
+        for level in [int(x) for x in args.levels.split(',') if x.strip()]:
+            print(f"\n🚀 Mode '{args.mode}': {args.pages} pages at concurrency {level}...")
+            row = run_level(workload, level, args.pages)
+            print(f"   ✓ {row['pagesPerSecond']} pages/s, p95 {row['p95']}s, {row['failures']} failed")
+            rows.append(row)
+
+        print_results(rows)
+
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({'mode': args.mode, 'settings': vars(args), 'results': rows}, f, indent=2)
+            print(f"💾 Report saved to {args.report}")
+
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    finally:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Event-driven job scheduler.
+
+Sleeps until the next job is due (no polling), runs jobs in a worker pool,
+prevents overlapping runs, limits concurrency per group (e.g. one browser
+at a time) and persists schedule state so missed runs - and runs that were
+still in flight when the process died - are caught up after a restart.
+"""
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config_manager import write_json_atomic
+
+# Longest single wait; Condition.wait can't be interrupted by Ctrl+C on Windows
+WAIT_SLICE = 1.0
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+def _ts(iso):
+    return datetime.fromisoformat(iso).timestamp() if iso else None
+
+
+class Job:
+    """A recurring task"""
+
+    def __init__(self, name, func, interval, jitter=0, max_instances=1, group=None):
+        """
+        interval / jitter are in seconds; each run is scheduled
+        interval + random(0, jitter) after the previous one started.
+        """
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_instances = max_instances
+        self.group = group
+
+        self.next_run = None
+        self.running = 0
+        self.last_run = None
+        self.last_status = None
+        self.last_duration = None
+        self.running_since = None
+
+    def schedule_next(self, now):
+        self.next_run = now + self.interval + random.uniform(0, self.jitter)
+
+    def state(self):
+        return {
+            'nextRun': _iso(self.next_run),
+            'lastRun': _iso(self.last_run),
+            'lastStatus': self.last_status,
+            'lastDuration': self.last_duration,
+            'runningSince': _iso(self.running_since)
+        }
+
+
+class Scheduler:
+    def __init__(self, state_file='schedule_state.json', workers=4, group_limits=None):
+        self.state_file = state_file
+        self.workers = workers
+        self.group_limits = group_limits or {}
+
+        self.jobs = {}
+        self._cond = threading.Condition()
+        self._group_running = {}
+        self._executor = None
+        self._stopped = False
+        self._state = self.load_state()
+
+    # -- state ---------------------------------------------------------------
+
+    def load_state(self):
+        """Load persisted schedule state"""
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_state(self):
+        """Persist next/last run times (caller holds the lock)"""
+        state = {name: job.state() for name, job in self.jobs.items()}
+        try:
+            write_json_atomic(self.state_file, state)
+        except OSError as e:
+            print(f"⚠️  Could not save schedule state: {e}")
+
+    # -- jobs ----------------------------------------------------------------
+
+    def add_job(self, job):
+        """Register a job; restores its schedule from the state file"""
+        now = time.time()
+        saved = self._state.get(job.name, {})
+
+        job.last_run = _ts(saved.get('lastRun'))
+        job.last_status = saved.get('lastStatus')
+        job.last_duration = saved.get('lastDuration')
+
+        next_run = _ts(saved.get('nextRun'))
+        if next_run is None:
+            job.next_run = now
+        elif saved.get('runningSince'):
+            # Started but never finished (crash / kill) - that run is missed too
+            print(f"⏪ {job.name}: run started at {saved['runningSince']} did not finish, catching up")
+            job.next_run = now
+        elif next_run < now:
+            # Missed while we were down - run once now (missed runs are coalesced)
+            print(f"⏪ {job.name}: missed run at {saved['nextRun']}, catching up")
+            job.next_run = now
+        else:
+            job.next_run = next_run
+
+        with self._cond:
+            self.jobs[job.name] = job
+            self._cond.notify()
+        return job
+
+    def run_now(self, name):
+        """Make a job due immediately"""
+        with self._cond:
+            job = self.jobs[name]
+            job.next_run = time.time()
+            self._cond.notify()
+
+    def next_runs(self):
+        """[(name, next_run datetime)] sorted by due time"""
+        with self._cond:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.next_run)
+            return [(job.name, datetime.fromtimestamp(job.next_run)) for job in jobs]
+
+    # -- loop ----------------------------------------------------------------
+
+    def _group_full(self, job):
+        if job.group is None or job.group not in self.group_limits:
+            return False
+        return self._group_running.get(job.group, 0) >= self.group_limits[job.group]
+
+    def _start(self, job, now):
+        job.running += 1
+        job.running_since = job.running_since or now
+        if job.group is not None:
+            self._group_running[job.group] = self._group_running.get(job.group, 0) + 1
+        job.schedule_next(now)
+        self.save_state()
+        self._executor.submit(self._run, job, now)
+
+    def _run(self, job, started):
+        print(f"\n▶️  Job '{job.name}' started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        status = 'SUCCESS'
+        try:
+            if job.func() is False:
+                status = 'WARNING'
+        except Exception as e:
+            status = 'ERROR'
+            print(f"❌ Job '{job.name}' failed: {e}")
+        finally:
+            duration = round(time.time() - started, 2)
+            with self._cond:
+                job.running -= 1
+                if not job.running:
+                    job.running_since = None
+                if job.group is not None:
+                    self._group_running[job.group] -= 1
+                job.last_run = started
+                job.last_status = status
+                job.last_duration = duration
+                self.save_state()
+                self._cond.notify()
+        print(f"⏹️  Job '{job.name}' finished: {status} in {duration}s")
+
+    def _dispatch(self):
+        """Start every due job that may run; return seconds until the next wake-up"""
+        now = time.time()
+        wait = None
+
+        for job in sorted(self.jobs.values(), key=lambda j: j.next_run):
+            if job.next_run <= now:
+                if job.running >= job.max_instances:
+                    print(f"⏭️  Job '{job.name}' still running, skipping this run")
+                    job.schedule_next(now)
+                    self.save_state()
+                elif self._group_full(job):
+                    # Stays due; a finishing job in the group wakes us up
+                    continue
+                else:
+                    self._start(job, now)
+
+            delay = job.next_run - now
+            if delay > 0 and (wait is None or delay < wait):
+                wait = delay
+
+        return wait
+
+    def run_forever(self):
+        """Block, running jobs as they come due, until stop() or Ctrl+C"""
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+        try:
+            with self._cond:
+                while not self._stopped:
+                    timeout = self._dispatch()
+                    # Short slices keep Ctrl+C responsive; _dispatch() re-checks the exact due times
+                    self._cond.wait(WAIT_SLICE if timeout is None else min(timeout, WAIT_SLICE))
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            with self._cond:
+                self.save_state()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
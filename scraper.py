@@ -1,13 +1,38 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 import json
 import time
 from datetime import datetime
+from config_manager import SelectorConfigManager, write_json_atomic
+from browser_watchdog import watchdog
+from conditional_refresh import RefreshValidator
+from dashboard_pages import publish
+from columnar_snapshots import write_snapshot
+from extraction_stats import STATS_FILE, StrategyStats
+
+AMAZON_URL = "https://www.amazon.com/Best-Sellers/zgbs"
+PRODUCT_HUNT_MOCK_KEY = "mock:producthunt"
+
+# One round trip for the whole product region instead of one per container
+REGION_JS = "return arguments[0].map(function(e) { return e.outerHTML; }).join('');"
 
 class ProductScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, amazon_url=AMAZON_URL, page_wait=5, conditional=False,
+                 products_file='products.json', stats_file=STATS_FILE):
         """Initialize scraper with config"""
+        self.amazon_url = amazon_url
+        self.page_wait = page_wait
+        self.products_file = products_file
+        
+        # Conditional refresh: skip pages unchanged since the last save
+        self.refresh = RefreshValidator() if conditional else None
+        self.unchanged = set()
+        self.changed = True
+        
+        # Hit rate / cost per extraction strategy, persisted across runs (None: this run only)
+        self.strategy_stats = StrategyStats(stats_file)
         self.options = Options()
         
         if headless:
@@ -22,35 +47,27 @@ class ProductScraper:
         self.options.add_experimental_option('useAutomationExtension', False)
         
         self.driver = None
+        self.config_manager = SelectorConfigManager()
         self.config = self.load_config()
     
     def load_config(self):
         """Load selectors from config file or use defaults"""
+        return self.config_manager.config
+    
+    def previous_products(self, platform_label):
+        """Products of one platform from the last saved products.json"""
         try:
-            with open('selector_config.json', 'r') as f:
-                config = json.load(f)
-                print("✅ Loaded selectors from selector_config.json")
-                return config
-        except FileNotFoundError:
-            print("⚠️  selector_config.json not found, using default selectors")
-            # Default selectors based on your inspection
-            return {
-                'platforms': {
-                    'amazon': {
-                        'selectors': {
-                            'container': {'selector': 'div[id][class*="p13n"]'},
-                            'price': 'span[class*="price"]',
-                            'image': 'img',
-                            'link': 'a.a-link-normal'
-                        }
-                    }
-                }
-            }
+            with open(self.products_file, 'r', encoding='utf-8') as f:
+                products = json.load(f).get('products', [])
+        except (FileNotFoundError, ValueError):
+            return []
+        return [p for p in products if p.get('platform') == platform_label]
     
     def start_driver(self):
         """Start Chrome driver"""
         try:
             self.driver = webdriver.Chrome(options=self.options)
+            watchdog.register(self.driver, 'scraper')
             print("✅ Chrome driver started")
             return True
         except Exception as e:
@@ -58,8 +75,89 @@ class ProductScraper:
             print("💡 Install: pip install webdriver-manager")
             return False
     
+    # -- Field extraction strategies (each returns a value or None) --
+    
+    def _title_from_img_alt(self, container):
+        img = container.find_element(By.TAG_NAME, 'img')
+        title = img.get_attribute('alt')
+        return title.strip() if title and title.strip() else None
+    
+    def _title_from_aria_label(self, container):
+        link = container.find_element(By.CSS_SELECTOR, 'a')
+        return link.get_attribute('aria-label') or None
+    
+    def _title_from_spans(self, container):
+        # Scans every span's text - one round trip per span, so the priciest
+        for span in container.find_elements(By.TAG_NAME, 'span'):
+            text = span.text.strip()
+            if text and len(text) > 10 and '$' not in text:
+                return text
+        return None
+    
+    def _text_at(self, container, selector):
+        elem = container.find_element(By.CSS_SELECTOR, selector)
+        return elem.text.strip() or (elem.get_attribute('alt') or '').strip() or None
+    
+    def _price_at(self, container, selector):
+        price_text = container.find_element(By.CSS_SELECTOR, selector).text.strip()
+        return price_text if price_text and '$' in price_text else None
+    
+    def _image_src(self, container):
+        img_src = container.find_element(By.TAG_NAME, 'img').get_attribute('src')
+        return img_src if img_src and 'http' in img_src else None
+    
+    def _href_at(self, container, selector):
+        return container.find_element(By.CSS_SELECTOR, selector).get_attribute('href') or None
+    
+    def amazon_strategies(self, plan):
+        """
+        Strategies per field, in the hand-written default order.
+        Config selectors are named after their selector text, so a new
+        selector starts with fresh stats instead of inheriting the old one's.
+        """
+        title = [
+            ('img_alt', self._title_from_img_alt),
+            ('aria_label', self._title_from_aria_label)
+        ]
+        if plan.get('title'):
+            title.append((f"selector:{plan.get('title')}", lambda c: self._text_at(c, plan.get('title'))))
+        title.append(('span_text', self._title_from_spans))
+        
+        return {
+            'title': title,
+            'price': [(f"selector:{plan.get('price')}", lambda c: self._price_at(c, plan.get('price')))],
+            'image': [('img_src', self._image_src)],
+            'link': [(f"selector:{plan.get('link')}", lambda c: self._href_at(c, plan.get('link')))]
+        }
+    
+    def extract_field(self, platform, field, container, strategies):
+        """Try strategies in learned order, recording hit/miss and cost of each"""
+        funcs = dict(strategies)
+        for name in self.strategy_stats.order(platform, field, [n for n, _ in strategies]):
+            start = time.perf_counter()
+            try:
+                value = funcs[name](container)
+            except WebDriverException:
+                value = None
+            self.strategy_stats.record(platform, field, name, bool(value), time.perf_counter() - start)
+            if value:
+                return value
+        return None
+    
     def scrape_amazon_bestsellers(self, limit=15):
         """Scrape Amazon using config selectors"""
+        # Get compiled selectors (picks up config changes between runs)
+        amazon_plan = self.config_manager.get_plan('amazon')
+        
+        # Conditional GET first - a 304 skips the browser entirely (unless the plan changed)
+        if self.refresh and self.refresh.probe(self.amazon_url, amazon_plan.fingerprint()):
+            previous = self.previous_products('Amazon')
+            if previous:
+                self.refresh.record(self.amazon_url, not_modified=True)
+                self.unchanged.add('amazon')
+                print("\n⏭️  Amazon Best Sellers not modified (304), skipping")
+                return previous
+        
         if not self.driver:
             if not self.start_driver():
                 return []
@@ -69,15 +167,13 @@ class ProductScraper:
         try:
             print("\n🔍 Scraping Amazon Best Sellers...")
             
-            url = "https://www.amazon.com/Best-Sellers/zgbs"
-            self.driver.get(url)
+            self.driver.get(self.amazon_url)
+            watchdog.note_page(self.driver)
             
             print("   ⏳ Loading page...")
-            time.sleep(5)
+            time.sleep(self.page_wait)
             
-            # Get container selector from config
-            amazon_config = self.config['platforms']['amazon']['selectors']
-            container_selector = amazon_config['container']['selector']
+            container_selector = amazon_plan.container
             
             print(f"   🎯 Using container: '{container_selector}'")
             
@@ -88,6 +184,21 @@ class ProductScraper:
             # Limit to requested amount
             containers = containers[:limit]
             
+            # Same product region and plan as the last saved run - skip per-item extraction
+            if self.refresh:
+                region = self.driver.execute_script(REGION_JS, containers)
+                same = self.refresh.unchanged(self.amazon_url, region, amazon_plan.fingerprint())
+                previous = self.previous_products('Amazon') if same else []
+                self.refresh.record(self.amazon_url, same_content=bool(previous))
+                
+                if previous:
+                    print("   ⏭️  Product list unchanged since last save, skipping extraction")
+                    self.unchanged.add('amazon')
+                    products = previous
+                    containers = []
+            
+            strategies = self.amazon_strategies(amazon_plan)
+            
             for i, container in enumerate(containers, 1):
                 try:
                     # Get ASIN (product ID) from container
@@ -95,72 +206,22 @@ class ProductScraper:
                     if not asin:
                         continue
                     
-                    # GET TITLE - Try multiple methods
-                    title = None
-                    
-                    # Method 1: Try to get from image alt text
-                    try:
-                        img = container.find_element(By.TAG_NAME, 'img')
-                        title = img.get_attribute('alt')
-                        if title and title.strip():
-                            title = title.strip()
-                    except:
-                        pass
-                    
-                    # Method 2: Try to get from link aria-label
-                    if not title:
-                        try:
-                            link = container.find_element(By.CSS_SELECTOR, 'a')
-                            title = link.get_attribute('aria-label')
-                        except:
-                            pass
-                    
-                    # Method 3: Get any text from container
-                    if not title:
-                        try:
-                            # Find spans with actual text
-                            spans = container.find_elements(By.TAG_NAME, 'span')
-                            for span in spans:
-                                text = span.text.strip()
-                                if text and len(text) > 10 and '$' not in text:
-                                    title = text
-                                    break
-                        except:
-                            pass
-                    
-                    # Fallback
+                    # Each field tries its strategies cheapest-expected-first (learned)
+                    title = self.extract_field('amazon', 'title', container, strategies['title'])
                     if not title:
                         title = f"Amazon Product #{i}"
                     
-                    # GET PRICE
-                    price = "See price on Amazon"
-                    try:
-                        price_elem = container.find_element(By.CSS_SELECTOR, amazon_config['price'])
-                        price_text = price_elem.text.strip()
-                        if price_text and '$' in price_text:
-                            price = price_text
-                    except:
-                        pass
+                    price = self.extract_field('amazon', 'price', container, strategies['price'])
+                    if not price:
+                        price = "See price on Amazon"
                     
-                    # GET IMAGE
-                    image = "https://via.placeholder.com/200x200?text=Amazon"
-                    try:
-                        img = container.find_element(By.TAG_NAME, 'img')
-                        img_src = img.get_attribute('src')
-                        if img_src and 'http' in img_src:
-                            image = img_src
-                    except:
-                        pass
+                    image = self.extract_field('amazon', 'image', container, strategies['image'])
+                    if not image:
+                        image = "https://via.placeholder.com/200x200?text=Amazon"
                     
-                    # GET LINK
-                    link = f"https://www.amazon.com/dp/{asin}"
-                    try:
-                        link_elem = container.find_element(By.CSS_SELECTOR, amazon_config['link'])
-                        href = link_elem.get_attribute('href')
-                        if href:
-                            link = href
-                    except:
-                        pass
+                    link = self.extract_field('amazon', 'link', container, strategies['link'])
+                    if not link:
+                        link = f"https://www.amazon.com/dp/{asin}"
                     
                     # Create product
                     product = {
@@ -187,6 +248,8 @@ class ProductScraper:
         except Exception as e:
             print(f"\n❌ Amazon scraping failed: {e}")
         
+        self.strategy_stats.save()
+        self.recycle_if_needed()
         return products
     
     def generate_mock_product_hunt(self, count=5):
@@ -225,6 +288,17 @@ class ProductScraper:
             products.append(product)
             print(f"   ✓ #{i}: {item['name']} - {item['votes']} votes")
         
+        if self.refresh:
+            content = json.dumps([[p['title'], p['description'], p['rating']] for p in products])
+            same = self.refresh.unchanged(PRODUCT_HUNT_MOCK_KEY, content)
+            previous = self.previous_products('Product Hunt') if same else []
+            self.refresh.record(PRODUCT_HUNT_MOCK_KEY, same_content=bool(previous))
+            
+            if previous:
+                print("   ⏭️  Product Hunt list unchanged since last save, keeping saved products")
+                self.unchanged.add('productHunt')
+                return previous
+        
         print(f"\n✅ Product Hunt: Generated {len(products)} trending products")
         return products
     
@@ -252,10 +326,15 @@ class ProductScraper:
         print(f"   • Product Hunt: {len(ph_products)}")
         print("=" * 70)
         
+        if self.refresh:
+            self.refresh.report()
+            self.changed = self.unchanged != {'amazon', 'productHunt'}
+        
         return all_products
     
-    def save_to_json(self, products, filename='products.json'):
+    def save_to_json(self, products, filename=None):
         """Save to JSON file"""
+        filename = filename or self.products_file
         try:
             data = {
                 'success': True,
@@ -264,20 +343,47 @@ class ProductScraper:
                 'lastUpdate': datetime.now().isoformat()
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Atomic, so the API never reads a half-written file
+            write_json_atomic(filename, data)
             
             print(f"\n✅ Saved to {filename}")
+            
+            # Post-save stage: precomputed API responses and dashboard pages for server.js
+            try:
+                manifest = publish(data)
+                print(f"✅ Serving artifacts published (version {manifest['version']})")
+            except OSError as e:
+                print(f"⚠️  Serving artifacts not updated: {e}")
+            
+            # Columnar copy for history analysis
+            try:
+                print(f"✅ History snapshot: {write_snapshot(data)}")
+            except OSError as e:
+                print(f"⚠️  History snapshot not written: {e}")
+            
+            # Only now do this run's validators become the baseline
+            if self.refresh:
+                self.refresh.commit()
             return True
             
         except Exception as e:
             print(f"\n❌ Save failed: {e}")
             return False
     
+    def recycle_if_needed(self):
+        """Restart the browser on the next page if it is over its memory/page budget"""
+        if not self.driver:
+            return
+        reason = watchdog.check(self.driver)
+        if reason:
+            print(f"♻️  Recycling browser: {reason}")
+            self.close()
+    
     def close(self):
         """Close browser"""
         if self.driver:
-            self.driver.quit()
+            watchdog.quit(self.driver)
+            self.driver = None
             print("✅ Browser closed")
 
 
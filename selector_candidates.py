@@ -0,0 +1,53 @@
+# Candidate selectors tried by html_inspector (live) and selector_corpus (offline).
+# Kept free of selenium imports so corpus workers start fast.
+
+AMAZON_CANDIDATES = {
+    'container': [
+        '.p13n-sc-uncoverable-faceout',
+        '[data-asin]',
+        '.zg-carousel-general-faceout',
+        '.zg-grid-general-faceout',
+        '.zg-item-immersion',
+        'div[id][class*="p13n"]'
+    ],
+    'title': [
+        'span.aok-inline-block',
+        '.p13n-sc-truncate',
+        'span[class*="truncate"]',
+        'div[class*="title"]',
+        'img[alt]'  # Sometimes title is in image alt
+    ],
+    'price': [
+        '.a-price .a-offscreen',
+        '.p13n-sc-price',
+        'span[class*="price"]',
+        '.a-price-whole'
+    ],
+    'image': ['img'],
+    'link': ['a.a-link-normal']
+}
+
+PRODUCT_HUNT_CANDIDATES = {
+    'container': [
+        'article',
+        'div[data-test*="post"]',
+        '[class*="Post"]',
+        'div[class*="item"]',
+        'section article'
+    ],
+    'title': [
+        'h3',
+        'h2',
+        'h1',
+        'a[href*="/posts/"]',
+        '[class*="title"]'
+    ],
+    'description': ['p', 'span[class*="tagline"]', 'div[class*="description"]'],
+    'link': ['a']
+}
+
+# Keyed like the platforms in selector_config.json
+CANDIDATES = {
+    'amazon': AMAZON_CANDIDATES,
+    'productHunt': PRODUCT_HUNT_CANDIDATES
+}
@@ -0,0 +1,440 @@
+"""
+Offline selector regression corpus.
+
+Runs the inspector's candidate selectors against stored page snapshots
+instead of a single live page load, scores every selector and writes the
+best set to selector_config.json.
+
+Snapshot layout (one folder per platform key from selector_config.json):
+
+    snapshots/
+        amazon/2025-10-17.html
+        amazon/2025-10-18.html.gz
+        productHunt/home-1.html
+
+Usage: python selector_corpus.py snapshots/ [--workers 8] [--dry-run]
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from config_manager import SelectorConfigManager
+from html_dom import parse_html
+from selector_candidates import CANDIDATES
+
+SNAPSHOT_EXTENSIONS = ('.html', '.htm', '.html.gz', '.htm.gz')
+
+# A field counts as filled in a snapshot when at least this share of products has it
+STABLE_FILL = 0.5
+
+
+# ---------------------------------------------------------------------------
+# What counts as a real product / a usable value
+# ---------------------------------------------------------------------------
+
+_ASIN_LINK = re.compile(r'/dp/([A-Z0-9]{10})(?=[/?#]|$)')
+_POST_LINK = re.compile(r'/(?:posts|products)/([^/?#]+)')
+
+
+def amazon_product_ids(node):
+    """Distinct ASINs in a node (data-asin attributes and /dp/<ASIN> links)"""
+    ids = set()
+    for elem in [node, *node.iter()]:
+        asin = elem.get_attribute('data-asin')
+        if asin:
+            ids.add(asin)
+        if elem.tag == 'a':
+            match = _ASIN_LINK.search(elem.get_attribute('href') or '')
+            if match:
+                ids.add(match.group(1))
+    return ids
+
+
+def product_hunt_product_ids(node):
+    """Distinct /posts/ or /products/ slugs linked from a node"""
+    ids = set()
+    for link in node.select('a[href]'):
+        match = _POST_LINK.search(link.get_attribute('href'))
+        if match:
+            ids.add(match.group(1))
+    return ids
+
+
+PRODUCT_IDS = {
+    'amazon': amazon_product_ids,
+    'productHunt': product_hunt_product_ids
+}
+
+
+def real_products(nodes, product_ids):
+    """
+    Matched nodes that are one real product: exactly one distinct product id
+    and no other node of the same match nested inside (outer wrappers and
+    banners count as false positives). Returns (products, distinct ids).
+    """
+    matched = {id(node) for node in nodes}
+    wrappers = set()
+    for node in nodes:
+        parent = node.parent
+        while parent is not None:
+            if id(parent) in matched:
+                wrappers.add(id(parent))
+            parent = parent.parent
+
+    products = []
+    ids = set()
+    for node in nodes:
+        if id(node) in wrappers:
+            continue
+        node_ids = product_ids(node)
+        if len(node_ids) == 1:
+            products.append(node)
+            ids.update(node_ids)
+    return products, ids
+
+
+def field_value(field, elem):
+    """Extract the value the scraper would use for a field, or None"""
+    if field == 'image':
+        src = elem.get_attribute('src') or ''
+        return src if 'http' in src else None
+    if field == 'link':
+        return elem.get_attribute('href') or None
+    if field == 'price':
+        text = elem.text
+        return text if any(c.isdigit() for c in text) else None
+    if field == 'title':
+        text = elem.text or (elem.get_attribute('alt') or '').strip()
+        return text if len(text) > 3 else None
+    return elem.text or None
+
+
+# ---------------------------------------------------------------------------
+# Per-snapshot evaluation (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def read_snapshot(path):
+    """Read a (possibly gzipped) HTML snapshot"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def evaluate_snapshot(task):
+    """Score every candidate selector against one snapshot"""
+    platform, path = task
+    candidates = CANDIDATES[platform]
+    product_ids = PRODUCT_IDS[platform]
+
+    result = {'platform': platform, 'path': path, 'containers': {}, 'error': None}
+
+    try:
+        root = parse_html(read_snapshot(path))
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+    for container_selector in candidates['container']:
+        try:
+            nodes = root.select(container_selector)
+        except ValueError as e:
+            result['containers'][container_selector] = {'error': str(e)}
+            continue
+
+        products, ids = real_products(nodes, product_ids)
+        fields = {}
+
+        for field, selectors in candidates.items():
+            if field == 'container':
+                continue
+            fields[field] = {}
+            for selector in selectors:
+                found = valid = 0
+                try:
+                    for product in products:
+                        elem = product.select_one(selector)
+                        if elem is None:
+                            continue
+                        found += 1
+                        if field_value(field, elem):
+                            valid += 1
+                except ValueError:
+                    pass
+                fields[field][selector] = (found, valid)
+
+        result['containers'][container_selector] = {
+            'matched': len(nodes),
+            'products': len(products),
+            'ids': sorted(ids),
+            'fields': fields
+        }
+
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+class CorpusStats:
+    """Streaming accumulator, so thousands of snapshots never sit in memory"""
+
+    def __init__(self, platform):
+        self.platform = platform
+        self.snapshots = 0
+        self.empty_snapshots = 0
+        self.failed = []
+        self.containers = {}
+        self.fields = {}
+
+    def add(self, result):
+        self.snapshots += 1
+        if result['error']:
+            self.failed.append({'path': result['path'], 'error': result['error']})
+            return
+
+        containers = result['containers']
+        # Distinct products any candidate found - duplicates and nesting cannot inflate it
+        all_ids = set()
+        for c in containers.values():
+            all_ids.update(c.get('ids', ()))
+        best_count = len(all_ids)
+        if best_count == 0:
+            # Error pages / empty loads: matches there are pure false positives
+            self.empty_snapshots += 1
+
+        for selector, c in containers.items():
+            stats = self.containers.setdefault(selector, {
+                'matched': 0, 'products': 0, 'coverage': 0.0,
+                'stable': 0, 'errors': 0
+            })
+            if 'error' in c:
+                stats['errors'] += 1
+                continue
+
+            stats['matched'] += c['matched']
+            stats['products'] += c['products']
+            if best_count:
+                stats['coverage'] += len(c['ids']) / best_count
+                if c['products'] and c['products'] * 2 >= c['matched']:
+                    stats['stable'] += 1
+
+            for field, selectors in c['fields'].items():
+                for field_selector, (found, valid) in selectors.items():
+                    key = (selector, field, field_selector)
+                    fstats = self.fields.setdefault(key, {
+                        'found': 0, 'valid': 0, 'products': 0, 'stable': 0
+                    })
+                    fstats['found'] += found
+                    fstats['valid'] += valid
+                    fstats['products'] += c['products']
+                    if c['products'] and valid >= STABLE_FILL * c['products']:
+                        fstats['stable'] += 1
+
+    def container_report(self):
+        """Container candidates scored by precision x coverage x stability"""
+        useful = self.snapshots - self.empty_snapshots - len(self.failed)
+        rows = []
+        for selector in CANDIDATES[self.platform]['container']:
+            s = self.containers.get(selector)
+            if not s:
+                continue
+            precision = s['products'] / s['matched'] if s['matched'] else 0.0
+            coverage = s['coverage'] / useful if useful else 0.0
+            stability = s['stable'] / useful if useful else 0.0
+            rows.append({
+                'selector': selector,
+                'precision': round(precision, 3),
+                'coverage': round(coverage, 3),
+                'stability': round(stability, 3),
+                'score': round(precision * coverage * stability, 3),
+                'matched': s['matched'],
+                'products': s['products'],
+                'errors': s['errors']
+            })
+        return sorted(rows, key=lambda r: r['score'], reverse=True)
+
+    def field_report(self, container_selector):
+        """Field candidates within the chosen container, scored by fill rate x stability"""
+        useful = self.snapshots - self.empty_snapshots - len(self.failed)
+        report = {}
+        for field, selectors in CANDIDATES[self.platform].items():
+            if field == 'container':
+                continue
+            rows = []
+            for selector in selectors:
+                s = self.fields.get((container_selector, field, selector))
+                if not s:
+                    continue
+                precision = s['valid'] / s['found'] if s['found'] else 0.0
+                fill_rate = s['valid'] / s['products'] if s['products'] else 0.0
+                stability = s['stable'] / useful if useful else 0.0
+                rows.append({
+                    'selector': selector,
+                    'precision': round(precision, 3),
+                    'fillRate': round(fill_rate, 3),
+                    'stability': round(stability, 3),
+                    'score': round(fill_rate * stability, 3)
+                })
+            # sorted() is stable, so candidate order breaks ties like the live inspector
+            report[field] = sorted(rows, key=lambda r: r['score'], reverse=True)
+        return report
+
+    def report(self):
+        containers = self.container_report()
+        best = containers[0] if containers and containers[0]['score'] > 0 else None
+
+        return {
+            'platform': self.platform,
+            'snapshots': self.snapshots,
+            'emptySnapshots': self.empty_snapshots,
+            'failed': self.failed,
+            'container': containers,
+            'fields': self.field_report(best['selector']) if best else {},
+            'best': best['selector'] if best else None
+        }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def find_snapshots(snapshot_dir, platforms=None):
+    """Return [(platform, path)] for every snapshot under snapshot_dir/<platform>/"""
+    tasks = []
+    for platform in platforms or CANDIDATES:
+        base = os.path.join(snapshot_dir, platform)
+        if not os.path.isdir(base):
+            continue
+        for dirpath, _, filenames in os.walk(base):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(SNAPSHOT_EXTENSIONS):
+                    tasks.append((platform, os.path.join(dirpath, filename)))
+    return tasks
+
+
+def evaluate_corpus(snapshot_dir, platforms=None, workers=None):
+    """Evaluate all snapshots in parallel, returning {platform: report}"""
+    tasks = find_snapshots(snapshot_dir, platforms)
+    if not tasks:
+        print(f"⚠️  No snapshots found in {snapshot_dir}")
+        return {}
+
+    workers = workers or os.cpu_count() or 1
+    stats = {}
+    start = time.perf_counter()
+
+    print(f"🔎 Evaluating {len(tasks)} snapshots with {workers} worker(s)...")
+
+    if workers == 1:
+        results = map(evaluate_snapshot, tasks)
+        for result in results:
+            stats.setdefault(result['platform'], CorpusStats(result['platform'])).add(result)
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(evaluate_snapshot, tasks, chunksize=chunksize):
+                stats.setdefault(result['platform'], CorpusStats(result['platform'])).add(result)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Done in {elapsed:.2f}s ({len(tasks) / elapsed:.1f} snapshots/s)")
+
+    return {platform: s.report() for platform, s in stats.items()}
+
+
+def print_report(reports):
+    """Print a readable summary"""
+    for platform, report in reports.items():
+        print("\n" + "=" * 70)
+        print(f"📊 {platform}: {report['snapshots']} snapshots "
+              f"({report['emptySnapshots']} empty/error, {len(report['failed'])} unreadable)")
+        print("=" * 70)
+
+        print("\n📦 CONTAINER SELECTORS (precision / coverage / stability → score):")
+        for row in report['container']:
+            print(f"   {row['precision']:.2f} / {row['coverage']:.2f} / {row['stability']:.2f}"
+                  f" → {row['score']:.2f}  '{row['selector']}'")
+
+        for field, rows in report['fields'].items():
+            print(f"\n🔹 {field.upper()} (precision / fill rate / stability → score):")
+            for row in rows:
+                print(f"   {row['precision']:.2f} / {row['fillRate']:.2f} / {row['stability']:.2f}"
+                      f" → {row['score']:.2f}  '{row['selector']}'")
+
+        if report['best']:
+            print(f"\n✨ BEST CONTAINER: '{report['best']}'")
+        else:
+            print("\n❌ No container selector found real products")
+
+
+def build_config(reports, base_config):
+    """Merge the best-scoring selectors into a selector config"""
+    config = dict(base_config or {})
+    config['platforms'] = dict(config.get('platforms', {}))
+    config['inspectedAt'] = datetime.now().isoformat()
+
+    for platform, report in reports.items():
+        if not report['best']:
+            continue
+
+        best_row = report['container'][0]
+        useful = report['snapshots'] - report['emptySnapshots'] - len(report['failed'])
+        selectors = {
+            'container': {
+                'selector': report['best'],
+                'count': round(best_row['products'] / useful) if useful else 0
+            }
+        }
+        for field, rows in report['fields'].items():
+            if rows and rows[0]['score'] > 0:
+                selectors[field] = rows[0]['selector']
+
+        entry = dict(config['platforms'].get(platform, {}))
+        entry['inspectedAt'] = config['inspectedAt']
+        entry['selectors'] = selectors
+        entry['corpus'] = {
+            'snapshots': report['snapshots'],
+            'score': best_row['score']
+        }
+        config['platforms'][platform] = entry
+
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score candidate selectors against stored page snapshots')
+    parser.add_argument('snapshot_dir', help='Directory with one sub-folder per platform')
+    parser.add_argument('--platform', action='append', choices=list(CANDIDATES),
+                        help='Only evaluate this platform (repeatable)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', default=None, help='Also write the full report to this JSON file')
+    parser.add_argument('--dry-run', action='store_true', help='Do not update selector_config.json')
+    args = parser.parse_args(argv)
+
+    reports = evaluate_corpus(args.snapshot_dir, args.platform, args.workers)
+    if not reports:
+        return
+
+    print_report(reports)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Report saved to {args.report}")
+
+    if args.dry_run:
+        print("\n💡 Dry run - selector_config.json not changed")
+        return
+
+    manager = SelectorConfigManager()
+    if manager.save_config(build_config(reports, manager.config)) is not None:
+        print("\n💾 Best selectors saved to selector_config.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,105 @@ function readProductsFromFile() {
     }
 }
 
+// Precomputed artifacts written by the Python scraper (see serving_artifacts.py)
+const SERVING_DIR = path.join(__dirname, 'serving');
+const MANIFEST_PATH = path.join(SERVING_DIR, 'manifest.json');
+let servingCache = { mtimeMs: 0, manifest: null, artifacts: {} };
+
+// Load the current artifact set into memory; only re-read when the manifest changes
+function loadServingArtifacts() {
+    try {
+        const stat = fs.statSync(MANIFEST_PATH);
+        if (stat.mtimeMs === servingCache.mtimeMs) {
+            return servingCache;
+        }
+        
+        const manifest = JSON.parse(fs.readFileSync(MANIFEST_PATH, 'utf8'));
+        const versionDir = path.join(SERVING_DIR, manifest.version);
+        const artifacts = {};
+        
+        for (const [name, info] of Object.entries(manifest.artifacts)) {
+            artifacts[name] = {
+                etag: info.etag,
+                body: fs.readFileSync(path.join(versionDir, info.file)),
+                gzip: fs.readFileSync(path.join(versionDir, info.gzip))
+            };
+        }
+        
+        const stats = artifacts.stats ? JSON.parse(artifacts.stats.body) : null;
+        const pagesIndex = artifacts['pages-index'] ? JSON.parse(artifacts['pages-index'].body) : null;
+        servingCache = { mtimeMs: stat.mtimeMs, manifest, artifacts, stats, pagesIndex };
+        return servingCache;
+    } catch (error) {
+        if (error.code !== 'ENOENT') {
+            console.error('❌ Error loading serving artifacts:', error.message);
+        }
+        return servingCache.manifest ? servingCache : null;
+    }
+}
+
+// Send a precomputed artifact (304 / gzip aware). Returns false if unavailable.
+function sendArtifact(req, res, name) {
+    const cache = loadServingArtifacts();
+    const artifact = cache && cache.artifacts[name];
+    
+    if (!artifact) {
+        return false;
+    }
+    
+    res.set('ETag', artifact.etag);
+    res.set('Vary', 'Accept-Encoding');
+    res.set('Cache-Control', 'no-cache');
+    res.type('application/json');
+    
+    if (req.headers['if-none-match'] === artifact.etag) {
+        res.status(304).end();
+        return true;
+    }
+    
+    if (req.acceptsEncodings('gzip')) {
+        res.set('Content-Encoding', 'gzip');
+        res.send(artifact.gzip);
+    } else {
+        res.send(artifact.body);
+    }
+    return true;
+}
+
+// Send a precomputed page with only the requested fields. Returns false if unavailable.
+function sendProjectedPage(req, res, name, fields) {
+    const cache = loadServingArtifacts();
+    const artifact = cache && cache.artifacts[name];
+    
+    if (!artifact) {
+        return false;
+    }
+    
+    const etag = `${artifact.etag.slice(0, -1)}-${fields.join('.')}"`;
+    res.set('ETag', etag);
+    res.set('Cache-Control', 'no-cache');
+    
+    if (req.headers['if-none-match'] === etag) {
+        res.status(304).end();
+        return true;
+    }
+    
+    const page = JSON.parse(artifact.body);
+    page.projection = fields.join(',');
+    page.products = page.products.map(product => {
+        const projected = {};
+        fields.forEach(field => {
+            if (field in product) {
+                projected[field] = product[field];
+            }
+        });
+        return projected;
+    });
+    
+    res.json(page);
+    return true;
+}
+
 // Root endpoint - API documentation
 app.get('/', (req, res) => {
     res.json({
@@ -36,7 +135,10 @@ app.get('/', (req, res) => {
             'GET /api/trending/amazon': 'Get Amazon products only',
             'GET /api/trending/producthunt': 'Get Product Hunt products only',
             'GET /api/health': 'Health check',
-            'GET /api/stats': 'Get statistics'
+            'GET /api/stats': 'Get statistics',
+            'GET /api/pages': 'Dashboard page index (slices, page counts, cursor)',
+            'GET /api/pages/:slice?page=1&view=full|summary&fields=title,price': 'One sorted page of a slice',
+            'GET /api/changes?since=<cursor>': 'Records changed since a cursor'
         },
         note: 'Data is updated by running: python scraper.py'
     });
@@ -44,6 +146,18 @@ app.get('/', (req, res) => {
 
 // Health check
 app.get('/api/health', (req, res) => {
+    const cache = loadServingArtifacts();
+    
+    if (cache && cache.stats) {
+        return res.json({
+            status: 'healthy',
+            timestamp: new Date().toISOString(),
+            dataAvailable: true,
+            productCount: cache.stats.totalProducts,
+            version: cache.manifest.version
+        });
+    }
+    
     const data = readProductsFromFile();
     
     res.json({
@@ -56,6 +170,10 @@ app.get('/api/health', (req, res) => {
 
 // Statistics endpoint
 app.get('/api/stats', (req, res) => {
+    if (sendArtifact(req, res, 'stats')) {
+        return;
+    }
+    
     const data = readProductsFromFile();
     
     if (!data) {
@@ -80,6 +198,10 @@ app.get('/api/stats', (req, res) => {
 
 // Get all trending products
 app.get('/api/trending', (req, res) => {
+    if (sendArtifact(req, res, 'trending')) {
+        return;
+    }
+    
     const data = readProductsFromFile();
     
     if (!data) {
@@ -100,6 +222,10 @@ app.get('/api/trending', (req, res) => {
 
 // Get Amazon products only
 app.get('/api/trending/amazon', (req, res) => {
+    if (sendArtifact(req, res, 'trending-amazon')) {
+        return;
+    }
+    
     const data = readProductsFromFile();
     
     if (!data) {
@@ -121,6 +247,10 @@ app.get('/api/trending/amazon', (req, res) => {
 
 // Get Product Hunt products only
 app.get('/api/trending/producthunt', (req, res) => {
+    if (sendArtifact(req, res, 'trending-producthunt')) {
+        return;
+    }
+    
     const data = readProductsFromFile();
     
     if (!data) {
@@ -140,6 +270,67 @@ app.get('/api/trending/producthunt', (req, res) => {
     });
 });
 
+// Dashboard page index
+app.get('/api/pages', (req, res) => {
+    if (sendArtifact(req, res, 'pages-index')) {
+        return;
+    }
+    
+    res.status(404).json({
+        success: false,
+        error: 'No pages available',
+        message: 'Please run: python trendtracker.py export'
+    });
+});
+
+// One page of a slice (all, amazon, producthunt, amazon.bestsellers, ...)
+app.get('/api/pages/:slice', (req, res) => {
+    const page = parseInt(req.query.page, 10) || 1;
+    const view = req.query.view || 'full';
+    
+    if (req.query.fields) {
+        const fields = String(req.query.fields).split(',').map(f => f.trim()).filter(Boolean);
+        if (sendProjectedPage(req, res, `page-${req.params.slice}-full-${page}`, fields)) {
+            return;
+        }
+    } else if (sendArtifact(req, res, `page-${req.params.slice}-${view}-${page}`)) {
+        return;
+    }
+    
+    res.status(404).json({
+        success: false,
+        error: 'Page not found',
+        message: 'See /api/pages for available slices and page counts'
+    });
+});
+
+// Records changed since a cursor
+app.get('/api/changes', (req, res) => {
+    const since = parseInt(req.query.since, 10);
+    
+    if (!Number.isNaN(since) && sendArtifact(req, res, `changes-${since}`)) {
+        return;
+    }
+    
+    const cache = loadServingArtifacts();
+    
+    if (!cache || !cache.pagesIndex) {
+        return res.status(404).json({
+            success: false,
+            error: 'No pages available',
+            message: 'Please run: python trendtracker.py export'
+        });
+    }
+    
+    // Cursor is older than the kept history (or missing): reload from /api/pages
+    res.json({
+        success: true,
+        reset: true,
+        since: Number.isNaN(since) ? null : since,
+        cursor: cache.pagesIndex.cursor
+    });
+});
+
 // 404 handler
 app.use((req, res) => {
     res.status(404).json({
@@ -150,7 +341,10 @@ app.use((req, res) => {
             '/api/trending/amazon',
             '/api/trending/producthunt',
             '/api/health',
-            '/api/stats'
+            '/api/stats',
+            '/api/pages',
+            '/api/pages/:slice',
+            '/api/changes'
         ]
     });
 });
@@ -0,0 +1,141 @@
+"""
+Ready-to-serve API artifacts, produced right after products.json is saved.
+
+Layout:
+    serving/
+        manifest.json            <- swapped atomically, points at one version
+        <version>/trending.json  (+ .gz)
+        <version>/trending-amazon.json
+        <version>/trending-producthunt.json
+        <version>/stats.json
+        <version>/page-*.json, changes-*.json, pages-index.json   (dashboard_pages.py)
+
+Every artifact is minified JSON with a pre-gzipped copy and a content hash
+used as its ETag. Each run writes a new version directory first and only
+then replaces manifest.json, so readers never mix two runs.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+from config_manager import write_json_atomic
+
+SERVING_DIR = 'serving'
+KEEP_VERSIONS = 3
+
+# Route slug -> platform label stored on products
+PLATFORM_SLICES = {
+    'amazon': 'Amazon',
+    'producthunt': 'Product Hunt'
+}
+
+
+def minify(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def etag_for(body):
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def build_payloads(data):
+    """API response bodies, shaped exactly like server.js builds them"""
+    products = data['products']
+    last_update = data.get('lastUpdate')
+
+    payloads = {
+        'trending': {
+            'success': True,
+            'count': data.get('count', len(products)),
+            'products': products,
+            'lastUpdate': last_update
+        }
+    }
+
+    for slug, label in PLATFORM_SLICES.items():
+        sliced = [p for p in products if p.get('platform') == label]
+        payloads[f'trending-{slug}'] = {
+            'success': True,
+            'count': len(sliced),
+            'products': sliced,
+            'lastUpdate': last_update
+        }
+
+    platforms = {}
+    for product in products:
+        platforms[product.get('platform')] = platforms.get(product.get('platform'), 0) + 1
+
+    payloads['stats'] = {
+        'success': True,
+        'totalProducts': data.get('count', len(products)),
+        'platforms': platforms,
+        'lastUpdate': last_update
+    }
+    return payloads
+
+
+def _cleanup(serving_dir, current):
+    """Drop old version directories, keeping the newest few for in-flight readers"""
+    versions = []
+    for name in os.listdir(serving_dir):
+        path = os.path.join(serving_dir, name)
+        if name != current and '.tmp.' not in name and os.path.isdir(path):
+            versions.append((os.path.getmtime(path), path))
+
+    for _, path in sorted(versions, reverse=True)[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def write_artifacts(data, serving_dir=SERVING_DIR, extra=None):
+    """
+    Write all artifacts for one products.json payload and publish them.
+    extra: optional {name: payload} for additional artifacts.
+    Returns the manifest.
+    """
+    bodies = {name: minify(payload) for name, payload in build_payloads(data).items()}
+    for name, payload in (extra or {}).items():
+        bodies[name] = minify(payload)
+
+    digest = hashlib.sha256()
+    for name in sorted(bodies):
+        digest.update(name.encode('utf-8'))
+        digest.update(bodies[name])
+    version = digest.hexdigest()[:16]
+
+    manifest = {
+        'version': version,
+        'generatedAt': datetime.now().isoformat(),
+        'lastUpdate': data.get('lastUpdate'),
+        'artifacts': {}
+    }
+    files = {}
+
+    for name, body in bodies.items():
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        files[f'{name}.json'] = body
+        files[f'{name}.json.gz'] = compressed
+        manifest['artifacts'][name] = {
+            'file': f'{name}.json',
+            'gzip': f'{name}.json.gz',
+            'etag': etag_for(body),
+            'bytes': len(body),
+            'gzipBytes': len(compressed)
+        }
+
+    # Identical content reuses the existing version directory
+    version_dir = os.path.join(serving_dir, version)
+    if not os.path.isdir(version_dir):
+        tmp_dir = f"{version_dir}.tmp.{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for filename, content in files.items():
+            with open(os.path.join(tmp_dir, filename), 'wb') as f:
+                f.write(content)
+        os.rename(tmp_dir, version_dir)
+
+    # Publishing = one atomic manifest swap
+    write_json_atomic(os.path.join(serving_dir, 'manifest.json'), manifest)
+    _cleanup(serving_dir, version)
+    return manifest
@@ -0,0 +1,342 @@
+"""
+TrendTracker command line.
+
+One non-interactive entry point for every tool. Heavy modules (selenium via
+scraper / html_inspector) are imported inside the subcommand that needs
+them, so lightweight commands like `status` and `export` start fast.
+
+    python trendtracker.py scrape [--conditional] [--amazon 10] [--ph 5]
+    python trendtracker.py inspect [--headed] [--corpus snapshots/]
+    python trendtracker.py update [--once]
+    python trendtracker.py export [--input products.json] [--history]
+    python trendtracker.py bench [load_test options...]
+    python trendtracker.py status
+
+Add --profile out.prof (cProfile) or --profile out.txt --profile-mode sample
+(collapsed stacks, flamegraph-ready) before the subcommand to profile a run.
+Both cover every thread of this process (scheduler jobs included); worker
+processes are not, so `inspect --corpus` runs single-process when profiled
+unless --workers is given.
+"""
+import argparse
+import json
+import os
+import sys
+
+
+# ---------------------------------------------------------------------------
+# Subcommands
+# ---------------------------------------------------------------------------
+
+def cmd_scrape(args):
+    from scraper import ProductScraper
+
+    scraper = ProductScraper(headless=not args.headed, page_wait=args.page_wait,
+                             conditional=args.conditional)
+    try:
+        products = scraper.scrape_all(amazon_count=args.amazon, ph_count=args.ph)
+        if not products:
+            print("\n⚠️  No products scraped")
+            return 1
+        if not scraper.changed:
+            print("\n⏭️  Nothing changed, products.json kept")
+            return 0
+        return 0 if scraper.save_to_json(products) else 1
+    finally:
+        scraper.close()
+
+
+def cmd_inspect(args):
+    if args.corpus:
+        import selector_corpus
+        corpus_args = [args.corpus] + (['--dry-run'] if args.dry_run else [])
+        workers = args.workers
+        if args.profile and not workers:
+            # Worker processes are invisible to the profiler - keep the work in this one
+            workers = 1
+        elif args.profile and workers > 1:
+            print("⚠️  Profiling covers this process only, not the corpus worker processes")
+        if workers:
+            corpus_args += ['--workers', str(workers)]
+        selector_corpus.main(corpus_args)
+        return 0
+
+    from html_inspector import inspect_amazon, inspect_product_hunt, save_results
+
+    amazon_results = inspect_amazon(headless=not args.headed, interactive=False, page_wait=args.page_wait)
+    ph_results = inspect_product_hunt(headless=not args.headed, interactive=False, page_wait=args.page_wait)
+
+    if args.dry_run:
+        print(json.dumps({'amazon': amazon_results, 'productHunt': ph_results}, indent=2)[:4000])
+    else:
+        save_results(amazon_results, ph_results)
+    return 0
+
+
+def cmd_update(args):
+    from auto_updater import AutoUpdater
+
+    updater = AutoUpdater(trace_memory=args.trace_memory, interactive=False)
+    if args.once:
+        updater.check_and_update()
+    else:
+        updater.start_scheduled_updates()
+    return 0
+
+
+def cmd_export(args):
+    from dashboard_pages import publish
+
+    try:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ {args.input} not found - run: python trendtracker.py scrape")
+        return 1
+
+    manifest = publish(data, args.out, page_size=args.page_size)
+    total = sum(a['bytes'] for a in manifest['artifacts'].values())
+    pages = sum(1 for name in manifest['artifacts'] if name.startswith('page-'))
+    print(f"✅ Exported {len(manifest['artifacts'])} artifacts ({pages} pages) to "
+          f"{args.out}/{manifest['version']} ({total / 1024:.1f} KB)")
+
+    if args.history:
+        from columnar_snapshots import write_snapshot
+        print(f"✅ History snapshot: {write_snapshot(data, args.history)}")
+    return 0
+
+
+def cmd_bench(args):
+    import load_test
+    load_test.main(args.bench_args)
+    return 0
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def cmd_status(args):
+    products = _read_json('products.json')
+    if products:
+        platforms = {}
+        for p in products.get('products', []):
+            platforms[p.get('platform')] = platforms.get(p.get('platform'), 0) + 1
+        print(f"📦 products.json: {products.get('count', 0)} products, last update {products.get('lastUpdate')}")
+        for name, count in platforms.items():
+            print(f"   • {name}: {count}")
+    else:
+        print("📦 products.json: missing")
+
+    manifest = _read_json(os.path.join('serving', 'manifest.json'))
+    if manifest:
+        print(f"🚚 Serving artifacts: version {manifest['version']} ({len(manifest['artifacts'])} files, "
+              f"generated {manifest['generatedAt']})")
+        cursor = _read_json(os.path.join('serving', 'cursor_state.json'))
+        if cursor:
+            print(f"   • Dashboard cursor: {cursor['cursor']}")
+    else:
+        print("🚚 Serving artifacts: none (run: python trendtracker.py export)")
+
+    config = _read_json('selector_config.json')
+    if config:
+        print(f"🎯 Selectors inspected at {config.get('inspectedAt')}")
+        for name, platform in config.get('platforms', {}).items():
+            container = platform.get('selectors', {}).get('container', {})
+            if isinstance(container, dict):
+                container = container.get('selector')
+            print(f"   • {name}: {container}")
+
+    schedule = _read_json('schedule_state.json')
+    if schedule:
+        print("📅 Scheduled jobs:")
+        for name, state in schedule.items():
+            print(f"   • {name}: next {state.get('nextRun')}, last {state.get('lastStatus') or '-'}")
+
+    if os.path.isdir('history'):
+        snapshots = [n for n in os.listdir('history') if n.endswith('.ttc')]
+        print(f"📚 History snapshots: {len(snapshots)}" + (f" (latest {max(snapshots)})" if snapshots else ""))
+
+    pids = _read_json('browser_pids.json')
+    print(f"🖥️  Tracked browser processes: {len(pids) if pids else 0}")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+def run_profiled(func, args):
+    """Run a subcommand under cProfile or a sampling profiler"""
+    if args.profile_mode == 'sample':
+        sampler = StackSampler(interval=args.sample_interval)
+        sampler.start()
+        try:
+            return func(args)
+        finally:
+            sampler.stop()
+            sampler.write(args.profile)
+            print(f"\n🔬 Sampled profile ({sampler.samples} samples) written to {args.profile}")
+
+    profiler = ThreadProfiler()
+    try:
+        return profiler.runcall(func, args)
+    finally:
+        stats = profiler.stats()
+        stats.dump_stats(args.profile)
+        print(f"\n🔬 cProfile output for {len(profiler.profiles)} thread(s) written to {args.profile} "
+              f"(top 15 by cumulative time):")
+        stats.sort_stats('cumulative').print_stats(15)
+
+
+class ThreadProfiler:
+    """cProfile for the calling thread and every thread started while it runs"""
+
+    def __init__(self):
+        import cProfile
+        import threading
+        self._threading = threading
+        self._new_profile = cProfile.Profile
+        self._lock = threading.Lock()
+        self.profiles = [cProfile.Profile()]
+
+    def _hook(self, frame, event, arg):
+        # First event in a new thread: hand the thread over to its own profiler
+        profile = self._new_profile()
+        with self._lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def runcall(self, func, *args):
+        self._threading.setprofile(self._hook)
+        try:
+            return self.profiles[0].runcall(func, *args)
+        finally:
+            self._threading.setprofile(None)
+
+    def stats(self):
+        """All threads' profiles merged into one pstats.Stats"""
+        import pstats
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+class StackSampler:
+    """Samples every thread's stack; writes collapsed stacks (rooted at the thread name) for flamegraphs"""
+
+    def __init__(self, interval=0.005):
+        import threading
+        self.interval = interval
+        self.samples = 0
+        self.counts = {}
+        self._threading = threading
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name='stack-sampler')
+
+    def _loop(self):
+        own = self._threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in self._threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {count}\n")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='trendtracker', description='TrendTracker tools')
+    parser.add_argument('--profile', metavar='FILE', help='Profile the subcommand and write results to FILE')
+    parser.add_argument('--profile-mode', choices=['cprofile', 'sample'], default='cprofile')
+    parser.add_argument('--sample-interval', type=float, default=0.005, help='Seconds between samples')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scrape', help='Scrape all platforms and save products.json')
+    p.add_argument('--amazon', type=int, default=10, help='Amazon products')
+    p.add_argument('--ph', type=int, default=5, help='Product Hunt products')
+    p.add_argument('--headed', action='store_true', help='Show the browser')
+    p.add_argument('--page-wait', type=float, default=5)
+    p.add_argument('--conditional', action='store_true', help='Skip pages unchanged since the last save')
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser('inspect', help='Find working selectors (live, or offline with --corpus)')
+    p.add_argument('--headed', action='store_true', help='Show the browser')
+    p.add_argument('--page-wait', type=float, default=5)
+    p.add_argument('--corpus', metavar='DIR', help='Score candidates against stored snapshots instead')
+    p.add_argument('--workers', type=int, default=None, help='Corpus worker processes')
+    p.add_argument('--dry-run', action='store_true', help='Do not write selector_config.json')
+    p.set_defaults(func=cmd_inspect)
+
+    p = sub.add_parser('update', help='Run the auto-updater (scheduled, or one cycle with --once)')
+    p.add_argument('--once', action='store_true', help='Run one inspect + scrape cycle and exit')
+    p.add_argument('--trace-memory', action='store_true', help='Report Python allocation growth per job')
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser('export', help='Write serving artifacts from products.json')
+    p.add_argument('--input', default='products.json')
+    p.add_argument('--out', default='serving')
+    p.add_argument('--page-size', type=int, default=24, help='Products per dashboard page')
+    p.add_argument('--history', nargs='?', const='history', metavar='DIR',
+                   help='Also write a columnar snapshot (default dir: history)')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('bench', help='Load-test against the local stand-in site (load_test.py options)')
+    p.add_argument('bench_args', nargs=argparse.REMAINDER)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser('status', help='Show data, artifact, selector and schedule status')
+    p.set_defaults(func=cmd_status)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    # bench passes its options straight through to load_test.py
+    args, extra = parser.parse_known_args(argv)
+    if extra:
+        if args.command != 'bench':
+            parser.error(f"unrecognized arguments: {' '.join(extra)}")
+        args.bench_args = extra + args.bench_args
+    try:
+        if args.profile:
+            return run_profiled(args.func, args)
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())